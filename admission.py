@@ -0,0 +1,274 @@
+"""
+도구 호출 승인 제어(admission control) 및 백프레셔
+
+도구마다 비용 등급(cheap/expensive)을 두고, 등급별로
+- 동시에 실행할 수 있는 호출 수(동시 실행 예산)
+- 예산이 찼을 때 기다릴 수 있는 호출 수(대기열)
+를 제한합니다. 대기열까지 가득 차면 즉시 429로, 대기 시간이 초과되면 503으로
+거절하며 두 경우 모두 Retry-After 값을 함께 알려줍니다.
+요청 본문 크기는 BodySizeLimitMiddleware가 Content-Length 또는 실제로 읽은 바이트 수로 제한하고,
+실행 슬롯은 AdmissionMiddleware가 도구의 비용 등급에 따라 배정합니다.
+
+모든 한도는 환경 변수로 조정할 수 있습니다.
+"""
+import asyncio
+import math
+import os
+import time
+import json
+from contextlib import asynccontextmanager
+from typing import Any, Callable, Dict, List, Optional
+
+from compression import replay_body
+from tracing import phase
+
+
+def _env_int(name: str, default: int) -> int:
+    return int(os.environ.get(name, default))
+
+
+def _env_float(name: str, default: float) -> float:
+    return float(os.environ.get(name, default))
+
+
+# 비용 등급
+COST_CHEAP = "cheap"
+COST_EXPENSIVE = "expensive"
+
+# 입력 크기 한도
+MAX_NUMBERS = _env_int("MCP_MAX_NUMBERS", 100_000)
+MAX_BODY_BYTES = _env_int("MCP_MAX_BODY_BYTES", 4 * 1024 * 1024)
+MAX_MATRIX_ELEMENTS = _env_int("MCP_MAX_MATRIX_ELEMENTS", 4_000_000)
+MAX_SAMPLES = _env_int("MCP_MAX_SAMPLES", 50_000_000)
+
+# 대기열에서 기다릴 수 있는 최대 시간 (초)
+QUEUE_TIMEOUT = _env_float("MCP_QUEUE_TIMEOUT", 5.0)
+
+
+class AdmissionRejected(Exception):
+    """호출이 승인되지 않았을 때 발생합니다."""
+
+    def __init__(self, status_code: int, reason: str, retry_after: int):
+        super().__init__(reason)
+        self.status_code = status_code
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+class CostClassLimiter:
+    """비용 등급 하나의 동시 실행 예산과 대기열을 관리합니다."""
+
+    def __init__(self, name: str, max_concurrent: int, max_queue: int, queue_timeout: float):
+        self.name = name
+        self.max_concurrent = max_concurrent
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self._semaphore = asyncio.Semaphore(max_concurrent)
+        self.in_flight = 0
+        self.waiting = 0
+        self.admitted = 0
+        self.rejected_queue_full = 0
+        self.rejected_timeout = 0
+        # 평균 처리 시간 (지수 이동 평균, 초) - Retry-After 추정에 사용
+        self._avg_service_time = 0.05
+
+    def retry_after(self) -> int:
+        """현재 대기열이 비워질 때까지의 예상 시간(초)을 반환합니다."""
+        backlog = (self.waiting + 1) / self.max_concurrent
+        return max(1, math.ceil(backlog * self._avg_service_time))
+
+    @asynccontextmanager
+    async def slot(self):
+        """실행 슬롯을 얻을 때까지 기다리고, 블록을 벗어나면 반납합니다."""
+        if self._semaphore.locked():
+            if self.waiting >= self.max_queue:
+                self.rejected_queue_full += 1
+                raise AdmissionRejected(
+                    429,
+                    f"'{self.name}' 등급의 대기열이 가득 찼습니다.",
+                    self.retry_after()
+                )
+            self.waiting += 1
+            try:
+                await asyncio.wait_for(self._semaphore.acquire(), self.queue_timeout)
+            except asyncio.TimeoutError:
+                self.rejected_timeout += 1
+                raise AdmissionRejected(
+                    503,
+                    f"'{self.name}' 등급의 대기 시간이 {self.queue_timeout}초를 초과했습니다.",
+                    self.retry_after()
+                )
+            finally:
+                self.waiting -= 1
+        else:
+            await self._semaphore.acquire()
+
+        self.in_flight += 1
+        self.admitted += 1
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            self._avg_service_time = 0.9 * self._avg_service_time + 0.1 * elapsed
+            self.in_flight -= 1
+            self._semaphore.release()
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "max_concurrent": self.max_concurrent,
+            "max_queue": self.max_queue,
+            "in_flight": self.in_flight,
+            "queue_depth": self.waiting,
+            "admitted": self.admitted,
+            "rejected_queue_full": self.rejected_queue_full,
+            "rejected_timeout": self.rejected_timeout,
+            "avg_service_time_ms": round(self._avg_service_time * 1000, 3)
+        }
+
+
+class AdmissionController:
+    """비용 등급별 제한기와 요청 크기 검사를 묶어 관리합니다."""
+
+    def __init__(self):
+        self.limiters = {
+            COST_CHEAP: CostClassLimiter(
+                COST_CHEAP,
+                _env_int("MCP_CHEAP_CONCURRENCY", 64),
+                _env_int("MCP_CHEAP_QUEUE", 256),
+                QUEUE_TIMEOUT
+            ),
+            COST_EXPENSIVE: CostClassLimiter(
+                COST_EXPENSIVE,
+                _env_int("MCP_EXPENSIVE_CONCURRENCY", os.cpu_count() or 2),
+                _env_int("MCP_EXPENSIVE_QUEUE", 16),
+                QUEUE_TIMEOUT
+            )
+        }
+        self.max_body_bytes = MAX_BODY_BYTES
+        self.rejected_body_too_large = 0
+        self.rejected_invalid_length = 0
+
+    def _too_large(self) -> AdmissionRejected:
+        self.rejected_body_too_large += 1
+        return AdmissionRejected(
+            413,
+            f"요청 본문이 최대 크기({self.max_body_bytes} bytes)를 초과했습니다.",
+            0
+        )
+
+    def check_body_size(self, content_length: str) -> None:
+        """Content-Length 헤더로 요청 본문 크기를 검사합니다."""
+        try:
+            length = int(content_length)
+        except ValueError:
+            length = -1
+        if length < 0:
+            self.rejected_invalid_length += 1
+            raise AdmissionRejected(400, f"Content-Length 헤더가 올바르지 않습니다: {content_length}", 0)
+        if length > self.max_body_bytes:
+            raise self._too_large()
+
+    async def read_body(self, receive) -> bytes:
+        """Content-Length 없이(chunked) 들어온 본문을 읽으면서 크기를 세고, 최대 크기를 넘으면 바로 거절합니다."""
+        chunks: List[bytes] = []
+        size = 0
+        more_body = True
+        while more_body:
+            message = await receive()
+            if message["type"] != "http.request":
+                break
+            chunk = message.get("body", b"")
+            size += len(chunk)
+            if size > self.max_body_bytes:
+                raise self._too_large()
+            chunks.append(chunk)
+            more_body = message.get("more_body", False)
+        return b"".join(chunks)
+
+    def slot(self, cost: str):
+        return self.limiters[cost].slot()
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "cost_classes": {name: limiter.snapshot() for name, limiter in self.limiters.items()},
+            "max_numbers": MAX_NUMBERS,
+            "max_matrix_elements": MAX_MATRIX_ELEMENTS,
+            "max_samples": MAX_SAMPLES,
+            "max_body_bytes": self.max_body_bytes,
+            "rejected_body_too_large": self.rejected_body_too_large,
+            "rejected_invalid_length": self.rejected_invalid_length
+        }
+
+
+async def _send_rejection(send, error: AdmissionRejected, tool: str) -> None:
+    """거절 사유를 JSON 응답으로 보냅니다 (Retry-After 값이 있으면 헤더로 함께 보냅니다)."""
+    body = json.dumps({"detail": error.reason, "tool": tool}, ensure_ascii=False).encode("utf-8")
+    headers = [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode())]
+    if error.retry_after:
+        headers.append((b"retry-after", str(error.retry_after).encode()))
+    await send({"type": "http.response.start", "status": error.status_code, "headers": headers})
+    await send({"type": "http.response.body", "body": body})
+
+
+class BodySizeLimitMiddleware:
+    """도구 호출 요청 본문의 크기를 제한하는 ASGI 미들웨어
+
+    Content-Length가 있으면 헤더 값으로 바로 검사하고, 없으면(chunked 업로드)
+    본문을 읽으면서 바이트 수를 세어 최대 크기를 넘는 즉시 413으로 거절합니다.
+    """
+
+    def __init__(self, app, controller: AdmissionController, tool_for_path: Callable[[str], Optional[str]]):
+        self.app = app
+        self.controller = controller
+        self.tool_for_path = tool_for_path
+
+    async def __call__(self, scope, receive, send):
+        tool = None
+        if scope["type"] == "http" and scope["method"] == "POST":
+            tool = self.tool_for_path(scope["path"])
+        if tool is None:
+            await self.app(scope, receive, send)
+            return
+
+        content_length = next(
+            (value.decode("latin-1") for key, value in scope["headers"] if key == b"content-length"), None
+        )
+        try:
+            if content_length is None:
+                receive = replay_body(await self.controller.read_body(receive), receive)
+            else:
+                self.controller.check_body_size(content_length)
+        except AdmissionRejected as e:
+            await _send_rejection(send, e, tool)
+            return
+        await self.app(scope, receive, send)
+
+
+class AdmissionMiddleware:
+    """도구의 비용 등급에 맞는 실행 슬롯을 얻은 뒤에만 호출을 실행하는 ASGI 미들웨어
+
+    대기열이 가득 차면 429, 대기 시간이 초과되면 503으로 거절합니다.
+    """
+
+    def __init__(self, app, controller: AdmissionController, tool_for_path: Callable[[str], Optional[str]],
+                 costs: Dict[str, str]):
+        self.app = app
+        self.controller = controller
+        self.tool_for_path = tool_for_path
+        self.costs = costs
+
+    async def __call__(self, scope, receive, send):
+        tool = None
+        if scope["type"] == "http" and scope["method"] == "POST":
+            tool = self.tool_for_path(scope["path"])
+        if tool is None:
+            await self.app(scope, receive, send)
+            return
+
+        try:
+            async with self.controller.slot(self.costs[tool]):
+                phase("receive")
+                await self.app(scope, receive, send)
+        except AdmissionRejected as e:
+            await _send_rejection(send, e, tool)
@@ -0,0 +1,92 @@
+"""
+응답 압축 벤치마크 (전송 크기 vs CPU 시간)
+
+StatisticsResponse 형태의 JSON(numbers 목록 포함)과 작은 사칙연산 응답을
+사용 가능한 압축 방식(gzip 레벨별, brotli, zstd)으로 압축해서
+압축률, 압축 시간, 해제 시간을 비교합니다.
+서버 없이 compression 모듈의 코덱을 직접 호출합니다.
+
+사용법:
+    python benchmarks/bench_compression.py --sizes 100 10000 100000
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import compression  # noqa: E402
+
+
+def _statistics_payload(size: int) -> bytes:
+    numbers = [round(random.gauss(100, 15), 6) for _ in range(size)]
+    return json.dumps({
+        "operation": "full_statistics",
+        "numbers": numbers,
+        "count": size,
+        "results": {"count": size, "mean": sum(numbers) / size},
+        "message": f"숫자 {size}개의 전체 통계"
+    }, ensure_ascii=False).encode("utf-8")
+
+
+def _add_payload() -> bytes:
+    return json.dumps({
+        "result": 15.0, "operation": "add", "a": 10.0, "b": 5.0, "message": "10.0 + 5.0 = 15.0"
+    }).encode("utf-8")
+
+
+def _variants():
+    codecs = compression.available_codecs()
+    variants = [
+        (f"gzip-{level}", lambda data, level=level: compression._gzip_compress(data, level), codecs["gzip"])
+        for level in (1, 6, 9)
+    ]
+    if "br" in codecs:
+        variants += [
+            (f"br-{quality}", lambda data, quality=quality: compression._brotli_compress(data, quality), codecs["br"])
+            for quality in (1, 4, 9)
+        ]
+    if "zstd" in codecs:
+        variants += [
+            (f"zstd-{level}", lambda data, level=level: compression._zstd_compress(data, level), codecs["zstd"])
+            for level in (1, 3, 9)
+        ]
+    return variants
+
+
+def _best_of(func, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="응답 압축 벤치마크")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 10000, 100000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    payloads = [("add", _add_payload())]
+    payloads += [(f"statistics n={size}", _statistics_payload(size)) for size in args.sizes]
+
+    print(f"최소 압축 크기(MCP_COMPRESS_MIN_BYTES): {compression.COMPRESS_MIN_BYTES} bytes")
+    print(f"{'페이로드':<22} {'방식':<8} {'원본':>10} {'압축':>10} {'비율':>7} {'압축(ms)':>10} {'해제(ms)':>10}")
+    print("-" * 84)
+    for label, data in payloads:
+        for name, compress, codec in _variants():
+            compressed = compress(data)
+            compress_s = _best_of(lambda: compress(data), args.repeat)
+            decompress_s = _best_of(lambda: codec.decompress(compressed, len(data)), args.repeat)
+            skipped = " (압축 생략 대상)" if len(data) < compression.COMPRESS_MIN_BYTES else ""
+            print(f"{label:<22} {name:<8} {len(data):>10} {len(compressed):>10} "
+                  f"{len(compressed) / len(data):>7.2%} {compress_s * 1000:>10.3f} {decompress_s * 1000:>10.3f}{skipped}")
+
+
+if __name__ == "__main__":
+    main()
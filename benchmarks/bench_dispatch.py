@@ -0,0 +1,85 @@
+"""
+calculate 디스패치 경로 호출당 비용 벤치마크
+
+다음 경로의 호출당 시간을 비교합니다.
+- legacy: 호출마다 operations dict를 만들고 개별 도구 함수를 거쳐 message를 항상 만드는 이전 방식
+- calculate / add: 미리 만들어진 _BINARY_OPERATIONS 테이블을 쓰는 현재 경로
+- include_message=False: message 문자열 생성을 생략한 경우
+
+HTTP와 프레임워크의 인자 검증은 포함하지 않습니다.
+측정 전에 모든 경로를 한 번씩 워밍업하고, 반복마다 경로를 번갈아 실행해서
+먼저 실행되는 경로가 불리하지 않도록 합니다. 각 경로의 최솟값과 중앙값을 출력합니다.
+
+사용법:
+    python benchmarks/bench_dispatch.py --calls 200000
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import mcp_server  # noqa: E402
+from mcp_server import CalculationResponse  # noqa: E402
+
+
+# 이전 구현을 그대로 옮긴 비교 기준
+def _legacy_add(a, b):
+    result = a + b
+    return CalculationResponse(result=result, operation="add", a=a, b=b, message=f"{a} + {b} = {result}")
+
+
+def _legacy_calculate(operation, a, b):
+    operations = {
+        "add": _legacy_add,
+        "subtract": _legacy_add,
+        "multiply": _legacy_add,
+        "divide": _legacy_add
+    }
+    if operation not in operations:
+        raise ValueError(operation)
+    return operations[operation](a, b)
+
+
+def _per_call_ns(func, calls: int) -> float:
+    start = time.perf_counter_ns()
+    for _ in range(calls):
+        func()
+    return (time.perf_counter_ns() - start) / calls
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="calculate 디스패치 벤치마크")
+    parser.add_argument("--calls", type=int, default=200000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    cases = [
+        ("legacy calculate", lambda: _legacy_calculate("add", 15.0, 25.0)),
+        ("calculate", lambda: mcp_server.calculate("add", 15.0, 25.0)),
+        ("calculate (message 생략)", lambda: mcp_server.calculate("add", 15.0, 25.0, include_message=False)),
+        ("add", lambda: mcp_server.add(15.0, 25.0)),
+        ("add (message 생략)", lambda: mcp_server.add(15.0, 25.0, include_message=False)),
+    ]
+
+    # 워밍업: 모든 경로의 코드와 캐시를 한 번씩 데웁니다
+    for _, func in cases:
+        _per_call_ns(func, args.calls)
+
+    samples = {name: [] for name, _ in cases}
+    for _ in range(args.repeat):
+        for name, func in cases:
+            samples[name].append(_per_call_ns(func, args.calls))
+
+    baseline = min(samples[cases[0][0]])
+    print(f"{'경로':<28} {'최소(ns)':>10} {'중앙값(ns)':>11} {'legacy 대비':>12}")
+    print("-" * 64)
+    for name, _ in cases:
+        best = min(samples[name])
+        print(f"{name:<28} {best:>10.0f} {statistics.median(samples[name]):>11.0f} {baseline / best:>11.2f}x")
+
+
+if __name__ == "__main__":
+    main()
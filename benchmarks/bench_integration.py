@@ -0,0 +1,79 @@
+"""
+적분 도구 코어 수 확장성 벤치마크
+
+워커 수(기본 1, 2, 4, ... CPU 코어 수)별로 monte_carlo와 quadrature의 실행 시간과
+1 워커 대비 속도 향상, 병렬 효율을 측정합니다. 같은 seed라도 워커 수가 다르면
+난수 스트림 분할이 달라지므로 추정값은 표준오차 범위 안에서 달라질 수 있습니다.
+서버 없이 integration 모듈을 직접 호출합니다.
+
+사용법:
+    python benchmarks/bench_integration.py --samples 20000000 --workers 1 2 4 8
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def _best_of(func, repeat: int):
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def _default_workers():
+    cores = os.cpu_count() or 1
+    counts = [1]
+    while counts[-1] * 2 < cores:
+        counts.append(counts[-1] * 2)
+    if cores > 1:
+        counts.append(cores)
+    return counts
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="적분 도구 확장성 벤치마크")
+    parser.add_argument("--samples", type=int, default=10_000_000)
+    parser.add_argument("--workers", type=int, nargs="+", default=_default_workers())
+    parser.add_argument("--expression", default="sin(x) * exp(-x**2 / 10)")
+    parser.add_argument("--tolerance", type=float, default=1e-12)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    # 풀은 처음 작업이 제출될 때 MCP_COMPUTE_WORKERS 크기로 만들어집니다
+    os.environ["MCP_COMPUTE_WORKERS"] = str(max(args.workers))
+    import integration
+
+    cases = [
+        ("monte_carlo", dict(lower=0.0, upper=20.0, expression=args.expression, distribution=None,
+                             parameters=None, method="monte_carlo", samples=args.samples, seed=42,
+                             tolerance=args.tolerance)),
+        ("mc + normal", dict(lower=-1.0, upper=2.0, expression="x**2", distribution="normal",
+                             parameters=None, method="monte_carlo", samples=args.samples, seed=42,
+                             tolerance=args.tolerance)),
+        ("quadrature", dict(lower=0.0, upper=200.0, expression="sin(50 * x) ** 2 / (x + 0.01)",
+                            distribution=None, parameters=None, method="quadrature", samples=1, seed=None,
+                            tolerance=args.tolerance)),
+    ]
+
+    print(f"CPU 코어: {os.cpu_count()}, 표본 수: {args.samples}")
+    print(f"{'방식':<14} {'워커':>4} {'시간(ms)':>10} {'속도 향상':>9} {'효율':>7} {'추정값':>20} {'표준오차':>11}")
+    print("-" * 84)
+    for name, kwargs in cases:
+        baseline = None
+        for workers in args.workers:
+            seconds, result = _best_of(lambda: integration.integrate(workers=workers, **kwargs), args.repeat)
+            baseline = baseline or seconds
+            speedup = baseline / seconds
+            print(f"{name:<14} {workers:>4} {seconds * 1000:>10.1f} {speedup:>8.2f}x {speedup / workers:>6.0%} "
+                  f"{result['estimate']:>20.12f} {result['standard_error']:>11.3g}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""
+선형대수 도구 벤치마크
+
+정사각 행렬 크기(기본 10 ~ 2000)별로 matmul, solve, determinant, inverse, least_squares 커널의 시간과
+입력 디코딩 비용(JSON 파싱 포함, 중첩 목록 vs packed float64 base64)을 측정합니다.
+서버 없이 numeric 모듈의 커널을 직접 호출합니다.
+
+사용법:
+    python benchmarks/bench_linalg.py --sizes 10 100 500 1000 2000 --threads 4
+"""
+import argparse
+import base64
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+class _Packed:
+    """PackedArray와 같은 모양의 입력 (shape, values)"""
+
+    def __init__(self, shape, values):
+        self.shape = shape
+        self.values = values
+
+
+def _best_of(func, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="선형대수 도구 벤치마크")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 50, 100, 500, 1000, 2000])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--threads", type=int, default=None, help="BLAS 스레드 수 (MCP_BLAS_THREADS)")
+    args = parser.parse_args()
+
+    # blas_threads가 NumPy보다 먼저 읽을 수 있도록 import 전에 설정합니다
+    if args.threads:
+        os.environ["MCP_BLAS_THREADS"] = str(args.threads)
+    import numeric
+
+    np = numeric.np
+    rng = np.random.default_rng(0)
+    limit = max(args.sizes) ** 2 * 2
+
+    print(f"BLAS 스레드: {numeric.blas_info()['blas_threads'] or '라이브러리 기본값'}")
+    print(f"{'n':>6} {'matmul(ms)':>11} {'GFLOP/s':>8} {'solve(ms)':>10} {'det(ms)':>9} "
+          f"{'inv(ms)':>9} {'lstsq(ms)':>10} {'list 디코딩':>12} {'base64 디코딩':>14}")
+    print("-" * 100)
+    for n in args.sizes:
+        # 대각 우세 행렬이라 항상 가역입니다
+        a = rng.standard_normal((n, n)) + n * np.eye(n)
+        b = rng.standard_normal(n)
+        tall = rng.standard_normal((2 * n, n))
+        tall_b = rng.standard_normal(2 * n)
+        repeat = args.repeat if n <= 500 else 1
+
+        matmul_s = _best_of(lambda: numeric.matmul(a, a), repeat)
+        solve_s = _best_of(lambda: numeric.solve(a, b), repeat)
+        det_s = _best_of(lambda: numeric.determinant(a), repeat)
+        inv_s = _best_of(lambda: numeric.inverse(a), repeat)
+        lstsq_s = _best_of(lambda: numeric.least_squares(tall, tall_b), repeat)
+
+        nested_json = json.dumps(a.tolist())
+        packed_json = json.dumps({
+            "shape": list(a.shape),
+            "values": base64.b64encode(a.astype("<f8").tobytes()).decode("ascii")
+        })
+        list_s = _best_of(lambda: numeric.decode_array(json.loads(nested_json), "A", limit), repeat)
+        packed_s = _best_of(
+            lambda: numeric.decode_array(_Packed(**json.loads(packed_json)), "A", limit), repeat
+        )
+
+        gflops = 2 * n ** 3 / matmul_s / 1e9
+        print(f"{n:>6} {matmul_s * 1000:>11.3f} {gflops:>8.2f} {solve_s * 1000:>10.3f} {det_s * 1000:>9.3f} "
+              f"{inv_s * 1000:>9.3f} {lstsq_s * 1000:>10.3f} {list_s * 1000:>10.3f}ms {packed_s * 1000:>12.3f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""
+콜드 스타트(import 시간) 벤치마크
+
+mcp_server 모듈을 새 인터프리터에서 반복해서 import 하여
+- 인터프리터 기본 기동 시간을 뺀 import 시간(중앙값)
+- `-X importtime` 기준으로 가장 비싼 모듈 목록
+- 지연 로드되어야 할 모듈이 import 시점에 올라오지 않았는지
+를 확인합니다. 예산을 넘거나 지연 모듈이 로드되면 종료 코드 1을 반환하므로
+CI에서 회귀 방지용으로 사용할 수 있습니다.
+
+사용법:
+    python benchmarks/bench_startup.py --runs 10 --max-ms 1500
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# import 시점에 올라오면 안 되는 무거운/선택적 모듈
+LAZY_MODULES = [
+    "numpy",
+    "numeric",
+    "integration",
+    "worker_pool",
+    "statistics",
+    "brotli",
+    "zstandard",
+]
+
+
+def _run(code: str, *flags: str) -> subprocess.CompletedProcess:
+    return subprocess.run(
+        [sys.executable, *flags, "-c", code],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+
+def _median_ms(code: str, runs: int) -> float:
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        _run(code)
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def _top_imports(limit: int):
+    """`-X importtime` 출력에서 누적 시간이 큰 모듈을 뽑습니다."""
+    stderr = _run("import mcp_server", "-X", "importtime").stderr
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        # "import time: <자체> | <누적> | <모듈>"
+        self_part, cumulative_us, name = line.split("|")
+        rows.append((int(cumulative_us), int(self_part.split(":")[1]), name.strip()))
+    rows.sort(reverse=True)
+    return rows[:limit]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="mcp_server import 시간 벤치마크")
+    parser.add_argument("--runs", type=int, default=10, help="반복 횟수")
+    parser.add_argument(
+        "--max-ms",
+        type=float,
+        default=float(os.environ.get("MCP_STARTUP_BUDGET_MS", "1500")),
+        help="허용되는 import 시간 (ms, 인터프리터 기동 시간 제외)",
+    )
+    parser.add_argument("--top", type=int, default=15, help="출력할 상위 모듈 수")
+    args = parser.parse_args()
+
+    baseline = _median_ms("pass", args.runs)
+    total = _median_ms("import mcp_server", args.runs)
+    import_ms = total - baseline
+
+    print(f"인터프리터 기동: {baseline:.1f} ms")
+    print(f"mcp_server import: {import_ms:.1f} ms (예산 {args.max_ms:.0f} ms)")
+    print("-" * 60)
+    print(f"{'누적(us)':>10} {'자체(us)':>10}  모듈")
+    for cumulative_us, self_us, name in _top_imports(args.top):
+        print(f"{cumulative_us:>10} {self_us:>10}  {name}")
+    print("-" * 60)
+
+    loaded = json.loads(
+        _run("import json, sys, mcp_server; print(json.dumps(sorted(sys.modules)))").stdout
+    )
+    eager = [name for name in LAZY_MODULES if name in loaded]
+
+    failed = False
+    if eager:
+        print(f"❌ 지연 로드되어야 할 모듈이 import 시점에 로드됨: {eager}")
+        failed = True
+    if import_ms > args.max_ms:
+        print(f"❌ import 시간이 예산을 초과했습니다: {import_ms:.1f} ms > {args.max_ms:.0f} ms")
+        failed = True
+    if not failed:
+        print("✅ 콜드 스타트 예산 통과")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
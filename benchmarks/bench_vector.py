@@ -0,0 +1,78 @@
+"""
+배열 도구 vs 스칼라 도구 벤치마크
+
+같은 입력을 스칼라 도구(power, square_root, factorial)를 원소마다 호출해 처리하는 경우와
+배열 도구(power_vector, square_root_vector, factorial_vector)로 한 번에 처리하는 경우를 비교합니다.
+HTTP 왕복 없이 도구 함수를 직접 호출하므로 순수 계산 + 응답 모델 생성 비용만 측정합니다.
+
+사용법:
+    python benchmarks/bench_vector.py --sizes 1000 10000 100000
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import mcp_server  # noqa: E402
+
+
+def _best_of(func, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def _cases(size: int):
+    floats = [random.uniform(0, 1000) for _ in range(size)]
+    ints = [random.randint(0, 20) for _ in range(size)]
+    return [
+        (
+            "power",
+            lambda: [mcp_server.power(x, 2.5) for x in floats],
+            lambda: mcp_server.power_vector(floats, 2.5)
+        ),
+        (
+            "square_root",
+            lambda: [mcp_server.square_root(x) for x in floats],
+            lambda: mcp_server.square_root_vector(floats)
+        ),
+        (
+            "factorial",
+            lambda: [mcp_server.factorial(n) for n in ints],
+            lambda: mcp_server.factorial_vector(ints)
+        ),
+        (
+            "square_root (base64)",
+            lambda: [mcp_server.square_root(x) for x in floats],
+            lambda: mcp_server.square_root_vector(floats, encoding="base64")
+        ),
+    ]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="배열 도구 vs 스칼라 도구 벤치마크")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    # 첫 호출의 NumPy 로드 시간은 측정에서 제외합니다
+    mcp_server.square_root_vector([1.0])
+
+    print(f"{'연산':<22} {'원소 수':>8} {'스칼라(ms)':>12} {'배열(ms)':>10} {'배속':>8}")
+    print("-" * 64)
+    for size in args.sizes:
+        for name, scalar, vector in _cases(size):
+            scalar_s = _best_of(scalar, args.repeat)
+            vector_s = _best_of(vector, args.repeat)
+            print(f"{name:<22} {size:>8} {scalar_s * 1000:>12.2f} {vector_s * 1000:>10.2f} "
+                  f"{scalar_s / vector_s:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,32 @@
+"""
+BLAS 스레드 수 설정 (MCP_BLAS_THREADS)
+
+OpenBLAS/MKL/OpenMP는 NumPy를 처음 불러올 때 환경 변수에서 스레드 수를 읽습니다.
+NumPy를 쓰는 커널 모듈(numeric, integration)은 numpy보다 먼저 이 모듈을 import 하므로
+어느 도구가 먼저 호출되더라도 설정이 한 번 적용됩니다.
+NumPy가 이미 다른 경로로 불러와졌다면 threadpoolctl로 실행 중인 스레드 풀을 제한합니다.
+"""
+import os
+import sys
+from typing import Dict, Optional
+
+BLAS_THREADS: Optional[str] = os.environ.get("MCP_BLAS_THREADS")
+
+# 설정이 적용된 방식 (environment / threadpoolctl, 설정이 없으면 None)
+APPLIED_VIA: Optional[str] = None
+
+if BLAS_THREADS:
+    if "numpy" not in sys.modules:
+        # 기존 OPENBLAS_NUM_THREADS 등보다 MCP_BLAS_THREADS가 우선합니다
+        for _var in ("OPENBLAS_NUM_THREADS", "OMP_NUM_THREADS", "MKL_NUM_THREADS"):
+            os.environ[_var] = BLAS_THREADS
+        APPLIED_VIA = "environment"
+    else:
+        import threadpoolctl
+        threadpoolctl.threadpool_limits(int(BLAS_THREADS), user_api="blas")
+        APPLIED_VIA = "threadpoolctl"
+
+
+def info() -> Dict[str, Optional[str]]:
+    """설정된 BLAS 스레드 수와 적용 방식을 반환합니다."""
+    return {"blas_threads": BLAS_THREADS, "applied_via": APPLIED_VIA}
@@ -0,0 +1,310 @@
+"""
+응답 압축 협상 및 압축된 요청 본문 해제
+
+- 응답: 클라이언트의 Accept-Encoding에 따라 zstd > br > gzip 순으로 고르며,
+  본문이 최소 크기보다 작으면(작은 사칙연산 응답 등) 압축하지 않습니다.
+- 요청: Content-Encoding이 붙은 본문(큰 numbers 업로드 등)을 해제해서 다음 단계로 넘깁니다.
+  압축 폭탄을 막기 위해 해제된 크기도 최대 본문 크기로 제한합니다.
+
+brotli, zstandard 패키지는 설치되어 있을 때만 사용하며 처음 압축할 때 불러옵니다.
+"""
+import importlib
+import importlib.util
+import json
+import os
+import zlib
+from typing import Callable, Dict, List, Optional
+
+# 압축할 최소 응답 크기 (bytes)
+COMPRESS_MIN_BYTES = int(os.environ.get("MCP_COMPRESS_MIN_BYTES", "1024"))
+# 압축하기 위해 모아둘 수 있는 최대 응답 크기 (bytes) - 넘으면 압축하지 않고 스트리밍합니다
+COMPRESS_MAX_BUFFER = int(os.environ.get("MCP_COMPRESS_MAX_BUFFER", str(16 * 1024 * 1024)))
+
+GZIP_LEVEL = int(os.environ.get("MCP_GZIP_LEVEL", "6"))
+BROTLI_QUALITY = int(os.environ.get("MCP_BROTLI_QUALITY", "4"))
+ZSTD_LEVEL = int(os.environ.get("MCP_ZSTD_LEVEL", "3"))
+
+# 압축할 응답 Content-Type
+_COMPRESSIBLE_TYPES = (b"application/json", b"text/")
+
+# 요청 본문 해제 시 한 번에 처리할 입력 크기
+_CHUNK = 64 * 1024
+# zstd는 압축률이 매우 높을 수 있어 더 작은 조각으로 넣습니다 (조각당 최대 약 8 MiB 출력)
+_ZSTD_CHUNK = 256
+
+
+class DecompressedTooLarge(Exception):
+    """해제된 요청 본문이 최대 크기를 넘었을 때 발생합니다."""
+
+
+class Codec:
+    """압축 방식 하나 (Content-Encoding 이름과 압축/해제 함수)"""
+
+    def __init__(self, name: str, compress: Callable[[bytes], bytes], decompress: Callable[[bytes, int], bytes]):
+        self.name = name
+        self.compress = compress
+        self.decompress = decompress
+
+
+def _gzip_compress(data: bytes, level: int = GZIP_LEVEL) -> bytes:
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    return compressor.compress(data) + compressor.flush()
+
+
+def _gzip_decompress(data: bytes, limit: int) -> bytes:
+    decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+    result = decompressor.decompress(data, limit + 1)
+    if len(result) > limit:
+        raise DecompressedTooLarge()
+    # 잘린 본문(스트림 끝 없음)이나 뒤에 붙은 쓰레기 데이터는 해제 실패로 처리합니다
+    if not decompressor.eof or decompressor.unused_data:
+        raise ValueError("gzip 스트림이 올바르게 끝나지 않았습니다.")
+    return result
+
+
+def _brotli_compress(data: bytes, quality: int = BROTLI_QUALITY) -> bytes:
+    return importlib.import_module("brotli").compress(data, quality=quality)
+
+
+def _brotli_decompress(data: bytes, limit: int) -> bytes:
+    # 입력을 조금씩 넣으면서 해제된 크기를 확인합니다
+    decompressor = importlib.import_module("brotli").Decompressor()
+    chunks: List[bytes] = []
+    size = 0
+    for offset in range(0, len(data), _CHUNK):
+        chunk = decompressor.process(data[offset:offset + _CHUNK])
+        size += len(chunk)
+        if size > limit:
+            raise DecompressedTooLarge()
+        chunks.append(chunk)
+    # 잘린 본문은 스트림 끝에 도달하지 못하므로 해제 실패로 처리합니다 (뒤에 붙은 데이터는 process()가 오류를 냅니다)
+    if not decompressor.is_finished():
+        raise ValueError("brotli 스트림이 올바르게 끝나지 않았습니다.")
+    return b"".join(chunks)
+
+
+def _zstd_compress(data: bytes, level: int = ZSTD_LEVEL) -> bytes:
+    return importlib.import_module("zstandard").ZstdCompressor(level=level).compress(data)
+
+
+def _zstd_decompress(data: bytes, limit: int) -> bytes:
+    # zstd는 입력 1바이트가 수만 배로 불어날 수 있으므로 작은 조각씩 넣으면서 해제된 크기를 확인합니다
+    decompressor = importlib.import_module("zstandard").ZstdDecompressor().decompressobj()
+    chunks: List[bytes] = []
+    size = 0
+    offset = 0
+    while offset < len(data) and not decompressor.eof:
+        chunk = decompressor.decompress(data[offset:offset + _ZSTD_CHUNK])
+        offset += _ZSTD_CHUNK
+        size += len(chunk)
+        if size > limit:
+            raise DecompressedTooLarge()
+        chunks.append(chunk)
+    # 잘린 프레임이나 프레임 뒤에 남은 데이터는 해제 실패로 처리합니다
+    if not decompressor.eof or decompressor.unused_data or offset < len(data):
+        raise ValueError("zstd 스트림이 올바르게 끝나지 않았습니다.")
+    return b"".join(chunks)
+
+
+def available_codecs() -> Dict[str, Codec]:
+    """사용 가능한 압축 방식을 선호 순서(zstd > br > gzip)대로 반환합니다."""
+    codecs: Dict[str, Codec] = {}
+    if importlib.util.find_spec("zstandard") is not None:
+        codecs["zstd"] = Codec("zstd", _zstd_compress, _zstd_decompress)
+    if importlib.util.find_spec("brotli") is not None:
+        codecs["br"] = Codec("br", _brotli_compress, _brotli_decompress)
+    codecs["gzip"] = Codec("gzip", _gzip_compress, _gzip_decompress)
+    return codecs
+
+
+def _parse_accept_encoding(value: str) -> Dict[str, float]:
+    """Accept-Encoding 헤더를 {방식: q값}으로 파싱합니다."""
+    accepted: Dict[str, float] = {}
+    for item in value.split(","):
+        name, _, params = item.strip().partition(";")
+        if not name:
+            continue
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        accepted[name.strip().lower()] = q
+    return accepted
+
+
+def _header(scope, name: bytes) -> Optional[str]:
+    for key, value in scope["headers"]:
+        if key == name:
+            return value.decode("latin-1")
+    return None
+
+
+async def _send_error(send, status: int, detail: str) -> None:
+    body = json.dumps({"detail": detail}, ensure_ascii=False).encode("utf-8")
+    await send({
+        "type": "http.response.start",
+        "status": status,
+        "headers": [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode())]
+    })
+    await send({"type": "http.response.body", "body": body})
+
+
+class CompressionMiddleware:
+    """응답 압축 협상과 요청 본문 해제를 처리하는 ASGI 미들웨어"""
+
+    def __init__(self, app, minimum_size: int = COMPRESS_MIN_BYTES, max_body_bytes: int = 4 * 1024 * 1024,
+                 max_buffer: int = COMPRESS_MAX_BUFFER):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.max_body_bytes = max_body_bytes
+        self.max_buffer = max_buffer
+        self.codecs = available_codecs()
+
+    def negotiate(self, accept_encoding: Optional[str]) -> Optional[Codec]:
+        if not accept_encoding:
+            return None
+        accepted = _parse_accept_encoding(accept_encoding)
+        wildcard = accepted.get("*", 0.0)
+        best = None
+        best_q = 0.0
+        for name, codec in self.codecs.items():
+            q = accepted.get(name, wildcard)
+            if q > best_q:
+                best, best_q = codec, q
+        return best
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        content_encoding = _header(scope, b"content-encoding")
+        if content_encoding and content_encoding.lower() != "identity":
+            codec = self.codecs.get(content_encoding.lower())
+            if codec is None:
+                await _send_error(send, 415, f"지원되지 않는 Content-Encoding입니다: {content_encoding}")
+                return
+            try:
+                body = codec.decompress(await self._read_body(receive), self.max_body_bytes)
+            except DecompressedTooLarge:
+                await _send_error(send, 413, f"요청 본문이 최대 크기({self.max_body_bytes} bytes)를 초과했습니다.")
+                return
+            except Exception:
+                await _send_error(send, 400, "압축된 요청 본문을 해제할 수 없습니다.")
+                return
+            scope = dict(scope)
+            scope["headers"] = [
+                (key, value) for key, value in scope["headers"]
+                if key not in (b"content-encoding", b"content-length")
+            ] + [(b"content-length", str(len(body)).encode())]
+            receive = replay_body(body, receive)
+
+        codec = self.negotiate(_header(scope, b"accept-encoding"))
+        if codec is None:
+            await self.app(scope, receive, send)
+            return
+        await self.app(scope, receive, _CompressingSender(send, codec, self.minimum_size, self.max_buffer))
+
+    async def _read_body(self, receive) -> bytes:
+        chunks: List[bytes] = []
+        size = 0
+        more_body = True
+        while more_body:
+            message = await receive()
+            chunk = message.get("body", b"")
+            size += len(chunk)
+            if size > self.max_body_bytes:
+                raise DecompressedTooLarge()
+            chunks.append(chunk)
+            more_body = message.get("more_body", False)
+        return b"".join(chunks)
+
+
+def replay_body(body: bytes, receive):
+    """해제된 본문을 한 번 돌려준 뒤에는 원래 receive로 넘깁니다 (연결 종료 감지용)."""
+    sent = False
+
+    async def replay():
+        nonlocal sent
+        if not sent:
+            sent = True
+            return {"type": "http.request", "body": body, "more_body": False}
+        return await receive()
+
+    return replay
+
+
+class _CompressingSender:
+    """응답 본문을 모아서 압축합니다.
+
+    응답 본문은 여러 조각(more_body=True)으로 나뉘어 올 수 있으므로,
+    마지막 조각까지 최대 버퍼 크기 안에서 모은 뒤 압축 여부를 정합니다.
+    버퍼 크기를 넘는 스트리밍 응답은 압축하지 않고 그대로 통과시킵니다.
+    """
+
+    def __init__(self, send, codec: Codec, minimum_size: int, max_buffer: int):
+        self.send = send
+        self.codec = codec
+        self.minimum_size = minimum_size
+        self.max_buffer = max_buffer
+        self.start_message = None
+        self.chunks: List[bytes] = []
+        self.size = 0
+        self.passthrough = False
+
+    async def __call__(self, message):
+        if message["type"] == "http.response.start":
+            self.start_message = message
+            headers = message.get("headers", [])
+            content_type = next((value for key, value in headers if key == b"content-type"), b"")
+            content_length = next((value for key, value in headers if key == b"content-length"), None)
+            # 압축 대상이 아니면 본문을 모으지 않습니다
+            self.passthrough = (
+                not content_type.startswith(_COMPRESSIBLE_TYPES)
+                or any(key == b"content-encoding" for key, _ in headers)
+                or (content_length is not None and int(content_length) < self.minimum_size)
+            )
+            return
+        if message["type"] != "http.response.body":
+            await self.send(message)
+            return
+        if self.start_message is None:
+            # 이미 압축하지 않기로 하고 시작 메시지를 보낸 응답
+            await self.send(message)
+            return
+        if self.passthrough:
+            await self._flush_start(self.start_message.get("headers", []))
+            await self.send(message)
+            return
+
+        body = message.get("body", b"")
+        self.chunks.append(body)
+        self.size += len(body)
+        more_body = message.get("more_body", False)
+        if more_body and self.size <= self.max_buffer:
+            return
+
+        body = b"".join(self.chunks)
+        self.chunks = []
+        headers = list(self.start_message.get("headers", []))
+        if more_body or len(body) < self.minimum_size:
+            # 버퍼 크기를 넘은 스트리밍 응답 또는 작은 응답은 그대로 보냅니다
+            await self._flush_start(headers)
+            await self.send({"type": "http.response.body", "body": body, "more_body": more_body})
+            return
+
+        body = self.codec.compress(body)
+        headers = [(key, value) for key, value in headers if key != b"content-length"]
+        headers += [
+            (b"content-encoding", self.codec.name.encode()),
+            (b"content-length", str(len(body)).encode())
+        ]
+        await self._flush_start(headers)
+        await self.send({"type": "http.response.body", "body": body, "more_body": False})
+
+    async def _flush_start(self, headers) -> None:
+        start, self.start_message = self.start_message, None
+        await self.send(dict(start, headers=list(headers) + [(b"vary", b"Accept-Encoding")]))
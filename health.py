@@ -0,0 +1,154 @@
+"""
+이벤트 루프 지연 및 포화 감시 (상태 확인)
+
+백그라운드 태스크가 일정 간격으로 잠들었다 깨어나면서 예정보다 늦게 깨어난 시간
+(이벤트 루프 지연)을 기록합니다. 동기 도구가 루프를 막으면 이 값이 커집니다.
+여기에 다음 지표를 더해 서버 상태를 판정합니다.
+- loop_lag_ms: 최근 구간(window)에서 가장 큰 이벤트 루프 지연
+- in_flight: 승인 제어에서 실행 중이거나 대기 중인 도구 호출 수
+- worker_queue_depth: 계산용 워커 풀에서 시작을 기다리는 작업 수
+
+지표마다 degraded/unready 임계값이 있으며, 가장 나쁜 지표의 상태가 전체 상태가 됩니다
+(healthy < degraded < unready). 임계값을 0으로 두면 해당 판정을 끕니다.
+"""
+import asyncio
+import os
+import sys
+import time
+from collections import deque
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Optional
+
+HEALTHY = "healthy"
+DEGRADED = "degraded"
+UNREADY = "unready"
+_SEVERITY = {HEALTHY: 0, DEGRADED: 1, UNREADY: 2}
+
+
+def _env_float(name: str, default: float) -> float:
+    return float(os.environ.get(name, default))
+
+
+def _worker_pool_stats() -> Dict[str, Any]:
+    """워커 풀 상태. 풀 모듈은 integrate가 처음 호출될 때 불러오므로 그 전에는 빈 상태로 봅니다."""
+    pool = sys.modules.get("worker_pool")
+    if pool is None:
+        return {"started": False, "queue_depth": 0, "running": 0}
+    return pool.stats()
+
+
+class LoopMonitor:
+    """이벤트 루프 지연을 측정하고 지표별 임계값으로 상태를 판정합니다."""
+
+    def __init__(self):
+        self.interval = _env_float("MCP_HEALTH_INTERVAL_MS", 100) / 1000
+        self.window = _env_float("MCP_HEALTH_WINDOW_S", 10)
+        cpus = os.cpu_count() or 1
+        # 지표 이름: (degraded 임계값, unready 임계값)
+        self.thresholds = {
+            "loop_lag_ms": (
+                _env_float("MCP_HEALTH_LAG_DEGRADED_MS", 100),
+                _env_float("MCP_HEALTH_LAG_UNREADY_MS", 1000)
+            ),
+            "in_flight": (
+                _env_float("MCP_HEALTH_INFLIGHT_DEGRADED", 64),
+                _env_float("MCP_HEALTH_INFLIGHT_UNREADY", 256)
+            ),
+            "worker_queue_depth": (
+                _env_float("MCP_HEALTH_QUEUE_DEGRADED", cpus),
+                _env_float("MCP_HEALTH_QUEUE_UNREADY", 4 * cpus)
+            )
+        }
+        self.started_at = time.time()
+        self._samples: deque = deque()
+        self._last_tick: Optional[float] = None
+        self._task: Optional[asyncio.Task] = None
+        self.stalls = 0
+
+    # --- 백그라운드 태스크 ---
+
+    def start(self) -> None:
+        """실행 중인 이벤트 루프에 측정 태스크를 띄웁니다."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run(), name="mcp-loop-monitor")
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self) -> None:
+        unready_ms = self.thresholds["loop_lag_ms"][1]
+        self._last_tick = time.perf_counter()
+        while True:
+            await asyncio.sleep(self.interval)
+            now = time.perf_counter()
+            lag_ms = max(0.0, (now - self._last_tick - self.interval) * 1000)
+            self._last_tick = now
+            self._record(now, lag_ms)
+            if unready_ms and lag_ms >= unready_ms:
+                self.stalls += 1
+
+    def _record(self, now: float, lag_ms: float) -> None:
+        self._samples.append((now, lag_ms))
+        while self._samples and now - self._samples[0][0] > self.window:
+            self._samples.popleft()
+
+    def loop_lag_ms(self) -> float:
+        """최근 구간의 최대 지연. 지금 루프가 막혀 있던 시간(마지막 측정 이후 초과분)도 포함합니다."""
+        now = time.perf_counter()
+        recent = max((lag for _, lag in self._samples), default=0.0)
+        if self._last_tick is None:
+            return recent
+        current = max(0.0, (now - self._last_tick - self.interval) * 1000)
+        return max(recent, current)
+
+    # --- 상태 판정 ---
+
+    def _classify(self, name: str, value: float) -> str:
+        degraded, unready = self.thresholds[name]
+        if unready and value >= unready:
+            return UNREADY
+        if degraded and value >= degraded:
+            return DEGRADED
+        return HEALTHY
+
+    def check(self, admission_snapshot: Callable[[], Dict[str, Any]]) -> Dict[str, Any]:
+        """지표를 모아 전체 상태와 지표별 상태를 반환합니다."""
+        classes = admission_snapshot()["cost_classes"].values()
+        pool = _worker_pool_stats()
+        values = {
+            "loop_lag_ms": round(self.loop_lag_ms(), 3),
+            "in_flight": sum(c["in_flight"] + c["queue_depth"] for c in classes),
+            "worker_queue_depth": pool["queue_depth"]
+        }
+        checks = {}
+        status = HEALTHY
+        for name, value in values.items():
+            degraded, unready = self.thresholds[name]
+            state = self._classify(name, value)
+            checks[name] = {"value": value, "status": state, "degraded_at": degraded, "unready_at": unready}
+            if _SEVERITY[state] > _SEVERITY[status]:
+                status = state
+        return {
+            "status": status,
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds").replace("+00:00", "Z"),
+            "uptime": round(time.time() - self.started_at, 1),
+            "checks": checks,
+            "monitor": {
+                "running": self._task is not None and not self._task.done(),
+                "interval_ms": self.interval * 1000,
+                "window_s": self.window,
+                "samples": len(self._samples),
+                "stalls": self.stalls
+            },
+            "worker_pool": pool
+        }
+
+
+# 서버 전체에서 공유하는 감시기
+loop_monitor = LoopMonitor()
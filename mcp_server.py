@@ -1,12 +1,39 @@
 from fastmcp import FastMCP
+from fastapi.responses import JSONResponse, PlainTextResponse
 from pydantic import BaseModel
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional, Union
+import contextlib
+import functools
+import importlib
 import math
-import statistics
+import operator
+
+from admission import (
+    COST_CHEAP,
+    COST_EXPENSIVE,
+    MAX_BODY_BYTES,
+    MAX_MATRIX_ELEMENTS,
+    MAX_NUMBERS,
+    MAX_SAMPLES,
+    AdmissionController,
+    AdmissionMiddleware,
+    BodySizeLimitMiddleware,
+)
+from compression import COMPRESS_MIN_BYTES, CompressionMiddleware
+from health import UNREADY, loop_monitor
+from profiler import ProfilingMiddleware, current_capture, profiler
+from tracing import TracingMiddleware, phase, trace_sink
 
 # MCP 서버 인스턴스 생성
 mcp = FastMCP("calculator-mcp")
 
+# 무거운 선택적 모듈(NumPy 커널, 스케치, 풀 등)은 처음 사용할 때 불러옵니다.
+# 워커가 자주 기동/종료되므로 모듈 로드 시점에는 필수 의존성만 가져옵니다.
+@functools.lru_cache(maxsize=None)
+def _lazy_import(name: str):
+    """모듈을 처음 호출될 때 import하고 이후에는 캐시된 모듈을 반환합니다."""
+    return importlib.import_module(name)
+
 # 계산 결과를 위한 응답 모델
 class CalculationResponse(BaseModel):
     result: float
@@ -23,83 +50,115 @@ class StatisticsResponse(BaseModel):
     results: Dict[str, float]
     message: str
 
-# 덧셈 함수
-@mcp.tool()
-def add(a: float, b: float) -> CalculationResponse:
-    """두 숫자를 더합니다."""
-    result = a + b
+# 배열 계산 결과를 위한 응답 모델
+# values는 encoding에 따라 숫자 목록(list) 또는 float64 버퍼의 base64 문자열(base64)입니다.
+# 정의역 오류가 난 원소는 null(NaN)이며 invalid_indices에 위치가 기록됩니다.
+class ArrayResponse(BaseModel):
+    operation: str
+    count: int
+    shape: List[int]
+    dtype: str
+    encoding: str
+    values: Union[List[Optional[float]], str]
+    invalid_count: int
+    invalid_indices: List[int]
+    details: Dict[str, Optional[float]] = {}
+    message: str
+
+# 적분 결과를 위한 응답 모델
+# monte_carlo는 standard_error가 표본 표준오차이고 moments에 병합 가능한 (n, mean, m2)를 담습니다.
+# quadrature는 standard_error가 Gauss-Kronrod 오차 추정값이며 moments는 비어 있습니다.
+class IntegrationResponse(BaseModel):
+    operation: str
+    method: str
+    estimate: float
+    standard_error: float
+    evaluations: int
+    workers: int
+    seed: Optional[int]
+    moments: Dict[str, float]
+    message: str
+
+# packed float64 배열 입력 (little-endian float64 버퍼의 base64 문자열과 shape)
+class PackedArray(BaseModel):
+    shape: List[int]
+    values: str
+
+# 행렬 입력: 중첩 목록 또는 PackedArray
+MatrixInput = Union[List[List[float]], PackedArray]
+# 우변 입력: 벡터, 행렬 또는 PackedArray
+RhsInput = Union[List[float], List[List[float]], PackedArray]
+
+# 숫자 목록 입력 검사 (빈 목록 및 최대 길이)
+def _validate_numbers(numbers: List[float]) -> None:
+    if not numbers:
+        raise ValueError("숫자 목록이 비어있습니다.")
+    if len(numbers) > MAX_NUMBERS:
+        raise ValueError(f"숫자 목록은 최대 {MAX_NUMBERS}개까지 입력할 수 있습니다.")
+
+# 이항 연산 직접 디스패치 테이블
+# 연산은 모듈 로드 시 한 번만 (커널, 기호) 형태로 등록되며,
+# 개별 도구(add/subtract/multiply/divide)와 calculate가 모두 _binary()를 통해 같은 경로로 실행됩니다.
+# 계산이 1µs 미만이라 compute/build_response 단계는 표시하지 않습니다 (트레이스에서는 input_check 단계에 포함).
+def _divide_kernel(a: float, b: float) -> float:
+    if b == 0:
+        raise ValueError("0으로 나눌 수 없습니다.")
+    return a / b
+
+_BINARY_OPERATIONS: Dict[str, tuple] = {
+    "add": (operator.add, "+"),
+    "subtract": (operator.sub, "-"),
+    "multiply": (operator.mul, "×"),
+    "divide": (_divide_kernel, "÷")
+}
+
+def _binary(operation: str, a: float, b: float, include_message: bool) -> CalculationResponse:
+    """테이블에서 커널을 찾아 실행합니다. message는 요청된 경우에만 만듭니다."""
+    entry = _BINARY_OPERATIONS.get(operation)
+    if entry is None:
+        raise ValueError(f"지원되지 않는 연산입니다: {operation}. 지원되는 연산: {list(_BINARY_OPERATIONS)}")
+    kernel, symbol = entry
+    
+    result = kernel(a, b)
     return CalculationResponse(
         result=result,
-        operation="add",
+        operation=operation,
         a=a,
         b=b,
-        message=f"{a} + {b} = {result}"
+        message=f"{a} {symbol} {b} = {result}" if include_message else ""
     )
 
+# 덧셈 함수
+def add(a: float, b: float, include_message: bool = True) -> CalculationResponse:
+    """두 숫자를 더합니다."""
+    return _binary("add", a, b, include_message)
+
 # 뺄셈 함수
-@mcp.tool()
-def subtract(a: float, b: float) -> CalculationResponse:
+def subtract(a: float, b: float, include_message: bool = True) -> CalculationResponse:
     """두 숫자에서 첫 번째 숫자에서 두 번째 숫자를 뺍니다."""
-    result = a - b
-    return CalculationResponse(
-        result=result,
-        operation="subtract",
-        a=a,
-        b=b,
-        message=f"{a} - {b} = {result}"
-    )
+    return _binary("subtract", a, b, include_message)
 
 # 곱셈 함수
-@mcp.tool()
-def multiply(a: float, b: float) -> CalculationResponse:
+def multiply(a: float, b: float, include_message: bool = True) -> CalculationResponse:
     """두 숫자를 곱합니다."""
-    result = a * b
-    return CalculationResponse(
-        result=result,
-        operation="multiply",
-        a=a,
-        b=b,
-        message=f"{a} × {b} = {result}"
-    )
+    return _binary("multiply", a, b, include_message)
 
 # 나눗셈 함수
-@mcp.tool()
-def divide(a: float, b: float) -> CalculationResponse:
+def divide(a: float, b: float, include_message: bool = True) -> CalculationResponse:
     """첫 번째 숫자를 두 번째 숫자로 나눕니다."""
-    if b == 0:
-        raise ValueError("0으로 나눌 수 없습니다.")
-    result = a / b
-    return CalculationResponse(
-        result=result,
-        operation="divide",
-        a=a,
-        b=b,
-        message=f"{a} ÷ {b} = {result}"
-    )
+    return _binary("divide", a, b, include_message)
 
 # 복합 계산 함수
-@mcp.tool()
-def calculate(operation: str, a: float, b: float) -> CalculationResponse:
+def calculate(operation: str, a: float, b: float, include_message: bool = True) -> CalculationResponse:
     """지정된 연산을 수행합니다. 지원되는 연산: add, subtract, multiply, divide"""
-    operations = {
-        "add": add,
-        "subtract": subtract,
-        "multiply": multiply,
-        "divide": divide
-    }
-    
-    if operation not in operations:
-        raise ValueError(f"지원되지 않는 연산입니다: {operation}. 지원되는 연산: {list(operations.keys())}")
-    
-    return operations[operation](a, b)
+    return _binary(operation, a, b, include_message)
 
 # 통계 계산 함수들
-@mcp.tool()
 def statistics_basic(numbers: List[float]) -> StatisticsResponse:
     """기본 통계를 계산합니다: 개수, 합계, 평균, 최대값, 최소값"""
-    if not numbers:
-        raise ValueError("숫자 목록이 비어있습니다.")
+    _validate_numbers(numbers)
     
+    phase("compute")
     count = len(numbers)
     total = sum(numbers)
     mean = total / count
@@ -114,6 +173,7 @@ def statistics_basic(numbers: List[float]) -> StatisticsResponse:
         "min": minimum
     }
     
+    phase("build_response")
     return StatisticsResponse(
         operation="basic_statistics",
         numbers=numbers,
@@ -122,15 +182,14 @@ def statistics_basic(numbers: List[float]) -> StatisticsResponse:
         message=f"숫자 {count}개의 기본 통계: 평균={mean:.2f}, 최대={maximum}, 최소={minimum}"
     )
 
-@mcp.tool()
 def statistics_advanced(numbers: List[float]) -> StatisticsResponse:
     """고급 통계를 계산합니다: 중앙값, 표준편차, 분산"""
-    if not numbers:
-        raise ValueError("숫자 목록이 비어있습니다.")
+    _validate_numbers(numbers)
     
     if len(numbers) < 2:
         raise ValueError("고급 통계를 계산하려면 최소 2개 이상의 숫자가 필요합니다.")
     
+    phase("compute")
     count = len(numbers)
     sorted_numbers = sorted(numbers)
     
@@ -153,6 +212,7 @@ def statistics_advanced(numbers: List[float]) -> StatisticsResponse:
         "mean": mean
     }
     
+    phase("build_response")
     return StatisticsResponse(
         operation="advanced_statistics",
         numbers=numbers,
@@ -161,12 +221,11 @@ def statistics_advanced(numbers: List[float]) -> StatisticsResponse:
         message=f"숫자 {count}개의 고급 통계: 중앙값={median:.2f}, 표준편차={std_dev:.2f}, 분산={variance:.2f}"
     )
 
-@mcp.tool()
 def statistics_full(numbers: List[float]) -> StatisticsResponse:
     """전체 통계를 계산합니다: 모든 기본 및 고급 통계"""
-    if not numbers:
-        raise ValueError("숫자 목록이 비어있습니다.")
+    _validate_numbers(numbers)
     
+    phase("compute")
     count = len(numbers)
     total = sum(numbers)
     mean = total / count
@@ -199,6 +258,7 @@ def statistics_full(numbers: List[float]) -> StatisticsResponse:
         "std_deviation": std_dev
     }
     
+    phase("build_response")
     return StatisticsResponse(
         operation="full_statistics",
         numbers=numbers,
@@ -208,10 +268,11 @@ def statistics_full(numbers: List[float]) -> StatisticsResponse:
     )
 
 # 수학 함수들
-@mcp.tool()
 def power(base: float, exponent: float) -> CalculationResponse:
     """거듭제곱을 계산합니다: base^exponent"""
+    phase("compute")
     result = base ** exponent
+    phase("build_response")
     return CalculationResponse(
         result=result,
         operation="power",
@@ -220,12 +281,13 @@ def power(base: float, exponent: float) -> CalculationResponse:
         message=f"{base}^{exponent} = {result}"
     )
 
-@mcp.tool()
 def square_root(number: float) -> CalculationResponse:
     """제곱근을 계산합니다."""
     if number < 0:
         raise ValueError("음수의 제곱근은 계산할 수 없습니다.")
+    phase("compute")
     result = math.sqrt(number)
+    phase("build_response")
     return CalculationResponse(
         result=result,
         operation="square_root",
@@ -234,7 +296,6 @@ def square_root(number: float) -> CalculationResponse:
         message=f"√{number} = {result}"
     )
 
-@mcp.tool()
 def factorial(n: int) -> CalculationResponse:
     """팩토리얼을 계산합니다: n!"""
     if n < 0:
@@ -242,7 +303,9 @@ def factorial(n: int) -> CalculationResponse:
     if n > 20:
         raise ValueError("20보다 큰 수의 팩토리얼은 계산할 수 없습니다.")
     
+    phase("compute")
     result = math.factorial(n)
+    phase("build_response")
     return CalculationResponse(
         result=float(result),
         operation="factorial",
@@ -251,6 +314,466 @@ def factorial(n: int) -> CalculationResponse:
         message=f"{n}! = {result}"
     )
 
+# 배열(벡터) 수학 함수들 - NumPy 커널은 처음 호출될 때 불러옵니다
+def _validate_encoding(encoding: str) -> None:
+    if encoding not in ("list", "base64"):
+        raise ValueError(f"지원되지 않는 인코딩입니다: {encoding}. 지원되는 인코딩: ['list', 'base64']")
+
+def _array_response(operation: str, result, invalid, encoding: str,
+                    message: Optional[str] = None, details: Optional[Dict[str, Optional[float]]] = None) -> ArrayResponse:
+    numeric = _lazy_import("numeric")
+    phase("build_response")
+    invalid_indices = numeric.mask_indices(invalid)
+    return ArrayResponse(
+        operation=operation,
+        count=int(result.size),
+        invalid_count=len(invalid_indices),
+        invalid_indices=invalid_indices,
+        details=details or {},
+        message=message or f"원소 {result.size}개 계산 완료 (정의역 오류 {len(invalid_indices)}개)",
+        **numeric.encode_array(result, encoding)
+    )
+
+def power_vector(bases: List[float], exponent: Union[float, List[float]], encoding: str = "list") -> ArrayResponse:
+    """원소별 거듭제곱을 계산합니다: bases[i]^exponent (exponent는 스칼라 또는 같은 길이의 목록)"""
+    _validate_numbers(bases)
+    _validate_encoding(encoding)
+    
+    numeric = _lazy_import("numeric")
+    phase("compute")
+    result, invalid = numeric.power(bases, exponent)
+    return _array_response("power_vector", result, invalid, encoding)
+
+def square_root_vector(numbers: List[float], encoding: str = "list") -> ArrayResponse:
+    """원소별 제곱근을 계산합니다. 음수 원소는 오류로 표시됩니다."""
+    _validate_numbers(numbers)
+    _validate_encoding(encoding)
+    
+    numeric = _lazy_import("numeric")
+    phase("compute")
+    result, invalid = numeric.square_root(numbers)
+    return _array_response("square_root_vector", result, invalid, encoding)
+
+def factorial_vector(numbers: List[int], encoding: str = "list") -> ArrayResponse:
+    """원소별 팩토리얼을 계산합니다. 0 이상 20 이하가 아닌 원소는 오류로 표시됩니다."""
+    _validate_numbers(numbers)
+    _validate_encoding(encoding)
+    
+    numeric = _lazy_import("numeric")
+    phase("compute")
+    result, invalid = numeric.factorial(numbers)
+    return _array_response("factorial_vector", result, invalid, encoding)
+
+# 선형대수 함수들 - NumPy(BLAS/LAPACK)로 계산하며 결과는 배열 응답 형식입니다
+def _decode_matrices(**arrays):
+    numeric = _lazy_import("numeric")
+    return [numeric.decode_array(value, name, MAX_MATRIX_ELEMENTS) for name, value in arrays.items()]
+
+def _linalg_response(operation: str, result, encoding: str, details=None) -> ArrayResponse:
+    numeric = _lazy_import("numeric")
+    shape = "×".join(str(n) for n in result.shape)
+    return _array_response(
+        operation, result, numeric.nonfinite(result), encoding,
+        message=f"{operation} 완료: 결과 크기 {shape}",
+        details=details
+    )
+
+def matrix_multiply(a: MatrixInput, b: RhsInput, encoding: str = "list") -> ArrayResponse:
+    """행렬 곱 A @ B를 계산합니다."""
+    _validate_encoding(encoding)
+    A, B = _decode_matrices(A=a, B=b)
+    
+    phase("compute")
+    result = _lazy_import("numeric").matmul(A, B)
+    return _linalg_response("matrix_multiply", result, encoding)
+
+def matrix_solve(a: MatrixInput, b: RhsInput, encoding: str = "list") -> ArrayResponse:
+    """연립방정식 A x = b를 풉니다 (A는 정사각 행렬)."""
+    _validate_encoding(encoding)
+    A, B = _decode_matrices(A=a, b=b)
+    
+    phase("compute")
+    result = _lazy_import("numeric").solve(A, B)
+    return _linalg_response("matrix_solve", result, encoding)
+
+def matrix_determinant(a: MatrixInput) -> ArrayResponse:
+    """정사각 행렬의 행렬식을 계산합니다."""
+    (A,) = _decode_matrices(A=a)
+    
+    phase("compute")
+    result = _lazy_import("numeric").determinant(A)
+    return _linalg_response("matrix_determinant", result, "list")
+
+def matrix_inverse(a: MatrixInput, encoding: str = "list") -> ArrayResponse:
+    """정사각 행렬의 역행렬을 계산합니다."""
+    _validate_encoding(encoding)
+    (A,) = _decode_matrices(A=a)
+    
+    phase("compute")
+    result = _lazy_import("numeric").inverse(A)
+    return _linalg_response("matrix_inverse", result, encoding)
+
+def least_squares(a: MatrixInput, b: RhsInput, encoding: str = "list") -> ArrayResponse:
+    """최소제곱해 argmin ||A x - b||를 계산합니다. details에 rank, 잔차 제곱합, 조건수를 담습니다."""
+    _validate_encoding(encoding)
+    A, B = _decode_matrices(A=a, b=b)
+    
+    phase("compute")
+    result, details = _lazy_import("numeric").least_squares(A, B)
+    return _linalg_response("least_squares", result, encoding, details)
+
+# 적분 함수 - 계산용 워커 풀에서 여러 코어로 나눠 실행합니다
+def integrate(lower: float, upper: float, expression: Optional[str] = None,
+              distribution: Optional[str] = None, parameters: Optional[Dict[str, float]] = None,
+              method: str = "monte_carlo", samples: int = 1_000_000, workers: int = 0,
+              seed: Optional[int] = None, tolerance: float = 1e-9) -> IntegrationResponse:
+    """수식 f(x), 분포 밀도 또는 둘의 곱을 [lower, upper]에서 적분합니다."""
+    if not 0 < samples <= MAX_SAMPLES:
+        raise ValueError(f"samples는 1 이상 {MAX_SAMPLES} 이하여야 합니다.")
+    if not tolerance > 0:
+        raise ValueError("tolerance는 0보다 커야 합니다.")
+    if seed is not None and seed < 0:
+        raise ValueError("seed는 0 이상이어야 합니다.")
+    
+    worker_pool = _lazy_import("worker_pool")
+    if workers < 0:
+        raise ValueError("workers는 0(자동) 이상이어야 합니다.")
+    workers = min(workers or worker_pool.MAX_WORKERS, worker_pool.MAX_WORKERS)
+    if method == "monte_carlo":
+        workers = min(workers, samples)
+    
+    phase("compute")
+    result = _lazy_import("integration").integrate(
+        lower, upper, expression, distribution, parameters, method, samples, workers, seed, tolerance
+    )
+    
+    phase("build_response")
+    target = " × ".join(filter(None, [expression, distribution and f"{distribution} pdf"]))
+    return IntegrationResponse(
+        operation="integrate",
+        method=method,
+        estimate=result["estimate"],
+        standard_error=result["standard_error"],
+        evaluations=result["evaluations"],
+        workers=workers,
+        seed=result["seed"],
+        moments=result["moments"],
+        message=f"∫[{lower}, {upper}] {target} ≈ {result['estimate']} (± {result['standard_error']:.3g})"
+    )
+
+# 도구 선언 테이블
+# MCP 등록과 사람 확인용 메타데이터(/, /tools)는 모두 이 테이블에서 만들어집니다.
+# 새 도구는 함수를 정의한 뒤 여기에 한 줄만 추가하면 됩니다.
+# cost는 승인 제어(admission control)에서 사용하는 비용 등급입니다.
+_AB_PARAMETERS = {
+    "a": {"type": "float", "description": "첫 번째 숫자"},
+    "b": {"type": "float", "description": "두 번째 숫자"},
+    "include_message": {"type": "boolean", "description": "message 문자열 포함 여부 (기본값 true)"}
+}
+
+_ENCODING_PARAMETER = {
+    "encoding": {"type": "string", "description": "결과 형식 (list/base64, 기본값 list)"}
+}
+
+_MATRIX_PARAMETERS = {
+    "a": {"type": "array | object", "description": "행렬 A (중첩 목록 또는 {shape, values} packed float64 base64)"}
+}
+
+TOOL_SPECS: List[Dict[str, Any]] = [
+    {
+        "name": "add",
+        "func": add,
+        "cost": COST_CHEAP,
+        "summary": "두 숫자 더하기",
+        "description": "두 숫자를 더합니다",
+        "parameters": _AB_PARAMETERS,
+        "example": {"a": 10, "b": 5}
+    },
+    {
+        "name": "subtract",
+        "func": subtract,
+        "cost": COST_CHEAP,
+        "summary": "두 숫자 빼기",
+        "description": "두 숫자를 뺍니다",
+        "parameters": _AB_PARAMETERS,
+        "example": {"a": 10, "b": 3}
+    },
+    {
+        "name": "multiply",
+        "func": multiply,
+        "cost": COST_CHEAP,
+        "summary": "두 숫자 곱하기",
+        "description": "두 숫자를 곱합니다",
+        "parameters": _AB_PARAMETERS,
+        "example": {"a": 6, "b": 7}
+    },
+    {
+        "name": "divide",
+        "func": divide,
+        "cost": COST_CHEAP,
+        "summary": "두 숫자 나누기",
+        "description": "두 숫자를 나눕니다",
+        "parameters": _AB_PARAMETERS,
+        "example": {"a": 20, "b": 4}
+    },
+    {
+        "name": "calculate",
+        "func": calculate,
+        "cost": COST_CHEAP,
+        "summary": "지정된 연산 수행",
+        "description": "지정된 연산을 수행합니다",
+        "parameters": {
+            "operation": {"type": "string", "description": "연산 종류 (add/subtract/multiply/divide)"},
+            **_AB_PARAMETERS
+        },
+        "example": {"operation": "add", "a": 15, "b": 25}
+    },
+    {
+        "name": "statistics_basic",
+        "func": statistics_basic,
+        "cost": COST_EXPENSIVE,
+        "summary": "기본 통계 계산 (개수, 합계, 평균, 최대값, 최소값)",
+        "description": "기본 통계를 계산합니다",
+        "parameters": {
+            "numbers": {"type": "array", "description": "숫자 목록 (예: [1, 2, 3, 4, 5])"}
+        },
+        "example": {"numbers": [1, 2, 3, 4, 5]}
+    },
+    {
+        "name": "statistics_advanced",
+        "func": statistics_advanced,
+        "cost": COST_EXPENSIVE,
+        "summary": "고급 통계 계산 (중앙값, 표준편차, 분산)",
+        "description": "고급 통계를 계산합니다",
+        "parameters": {
+            "numbers": {"type": "array", "description": "숫자 목록 (최소 2개 이상)"}
+        },
+        "example": {"numbers": [1, 2, 3, 4, 5]}
+    },
+    {
+        "name": "statistics_full",
+        "func": statistics_full,
+        "cost": COST_EXPENSIVE,
+        "summary": "전체 통계 계산 (모든 통계)",
+        "description": "전체 통계를 계산합니다",
+        "parameters": {
+            "numbers": {"type": "array", "description": "숫자 목록"}
+        },
+        "example": {"numbers": [1, 2, 3, 4, 5]}
+    },
+    {
+        "name": "power",
+        "func": power,
+        "cost": COST_CHEAP,
+        "summary": "거듭제곱 계산",
+        "description": "거듭제곱을 계산합니다",
+        "parameters": {
+            "base": {"type": "float", "description": "밑수"},
+            "exponent": {"type": "float", "description": "지수"}
+        },
+        "example": {"base": 2, "exponent": 3}
+    },
+    {
+        "name": "square_root",
+        "func": square_root,
+        "cost": COST_CHEAP,
+        "summary": "제곱근 계산",
+        "description": "제곱근을 계산합니다",
+        "parameters": {
+            "number": {"type": "float", "description": "양수"}
+        },
+        "example": {"number": 16}
+    },
+    {
+        "name": "factorial",
+        "func": factorial,
+        "cost": COST_CHEAP,
+        "summary": "팩토리얼 계산",
+        "description": "팩토리얼을 계산합니다",
+        "parameters": {
+            "n": {"type": "integer", "description": "0 이상 20 이하의 정수"}
+        },
+        "example": {"n": 5}
+    },
+    {
+        "name": "power_vector",
+        "func": power_vector,
+        "cost": COST_EXPENSIVE,
+        "summary": "원소별 거듭제곱 계산 (배열)",
+        "description": "숫자 목록의 각 원소에 거듭제곱을 계산합니다",
+        "parameters": {
+            "bases": {"type": "array", "description": "밑수 목록"},
+            "exponent": {"type": "float | array", "description": "지수 (스칼라 또는 밑수와 같은 길이의 목록)"},
+            **_ENCODING_PARAMETER
+        },
+        "example": {"bases": [1, 2, 3, 4], "exponent": 2}
+    },
+    {
+        "name": "square_root_vector",
+        "func": square_root_vector,
+        "cost": COST_EXPENSIVE,
+        "summary": "원소별 제곱근 계산 (배열)",
+        "description": "숫자 목록의 각 원소의 제곱근을 계산합니다",
+        "parameters": {
+            "numbers": {"type": "array", "description": "숫자 목록 (음수 원소는 오류로 표시)"},
+            **_ENCODING_PARAMETER
+        },
+        "example": {"numbers": [4, 9, -1, 16]}
+    },
+    {
+        "name": "factorial_vector",
+        "func": factorial_vector,
+        "cost": COST_EXPENSIVE,
+        "summary": "원소별 팩토리얼 계산 (배열)",
+        "description": "정수 목록의 각 원소의 팩토리얼을 계산합니다",
+        "parameters": {
+            "numbers": {"type": "array", "description": "정수 목록 (0~20 범위 밖의 원소는 오류로 표시)"},
+            **_ENCODING_PARAMETER
+        },
+        "example": {"numbers": [0, 5, 10, 25]}
+    },
+    {
+        "name": "matrix_multiply",
+        "func": matrix_multiply,
+        "cost": COST_EXPENSIVE,
+        "summary": "행렬 곱 계산",
+        "description": "두 행렬의 곱 A @ B를 계산합니다",
+        "parameters": {
+            **_MATRIX_PARAMETERS,
+            "b": {"type": "array | object", "description": "행렬 또는 벡터 B"},
+            **_ENCODING_PARAMETER
+        },
+        "example": {"a": [[1, 2], [3, 4]], "b": [[5, 6], [7, 8]]}
+    },
+    {
+        "name": "matrix_solve",
+        "func": matrix_solve,
+        "cost": COST_EXPENSIVE,
+        "summary": "연립방정식 풀이",
+        "description": "연립방정식 A x = b를 풉니다",
+        "parameters": {
+            **_MATRIX_PARAMETERS,
+            "b": {"type": "array | object", "description": "우변 벡터 또는 행렬 b"},
+            **_ENCODING_PARAMETER
+        },
+        "example": {"a": [[3, 1], [1, 2]], "b": [9, 8]}
+    },
+    {
+        "name": "matrix_determinant",
+        "func": matrix_determinant,
+        "cost": COST_EXPENSIVE,
+        "summary": "행렬식 계산",
+        "description": "정사각 행렬의 행렬식을 계산합니다",
+        "parameters": _MATRIX_PARAMETERS,
+        "example": {"a": [[1, 2], [3, 4]]}
+    },
+    {
+        "name": "matrix_inverse",
+        "func": matrix_inverse,
+        "cost": COST_EXPENSIVE,
+        "summary": "역행렬 계산",
+        "description": "정사각 행렬의 역행렬을 계산합니다",
+        "parameters": {**_MATRIX_PARAMETERS, **_ENCODING_PARAMETER},
+        "example": {"a": [[4, 7], [2, 6]]}
+    },
+    {
+        "name": "least_squares",
+        "func": least_squares,
+        "cost": COST_EXPENSIVE,
+        "summary": "최소제곱해 계산",
+        "description": "||A x - b||를 최소화하는 x를 계산합니다",
+        "parameters": {
+            **_MATRIX_PARAMETERS,
+            "b": {"type": "array | object", "description": "우변 벡터 또는 행렬 b"},
+            **_ENCODING_PARAMETER
+        },
+        "example": {"a": [[1, 0], [1, 1], [1, 2]], "b": [1, 2, 2]}
+    },
+    {
+        "name": "integrate",
+        "func": integrate,
+        "cost": COST_EXPENSIVE,
+        "summary": "몬테카를로/수치 적분",
+        "description": "수식 또는 분포를 구간에서 여러 코어로 적분하고 추정값과 표준오차를 반환합니다",
+        "parameters": {
+            "lower": {"type": "float", "description": "구간 하한 (분포와 monte_carlo는 -inf 허용)"},
+            "upper": {"type": "float", "description": "구간 상한 (분포와 monte_carlo는 inf 허용)"},
+            "expression": {"type": "string", "description": "x에 대한 수식 (예: sin(x) * exp(-x**2))"},
+            "distribution": {"type": "string", "description": "분포 (normal/uniform/exponential/lognormal/logistic)"},
+            "parameters": {"type": "object", "description": "분포 매개변수 (예: {\"mean\": 0, \"std\": 1})"},
+            "method": {"type": "string", "description": "monte_carlo 또는 quadrature (기본값 monte_carlo)"},
+            "samples": {"type": "integer", "description": f"몬테카를로 표본 수 (기본값 1000000, 최대 {MAX_SAMPLES})"},
+            "workers": {"type": "integer", "description": "사용할 코어 수 (기본값 0 = 전체)"},
+            "seed": {"type": "integer", "description": "난수 시드 (같은 seed/samples/workers면 같은 결과)"},
+            "tolerance": {"type": "float", "description": "quadrature 허용 오차 (기본값 1e-9)"}
+        },
+        "example": {"lower": 0, "upper": 3.141592653589793, "expression": "sin(x)", "seed": 42}
+    }
+]
+
+# 도구 함수 래퍼
+# - 트레이스 단계: 진입 시 input_check, 반환 후 serialize (compute/build_response는 도구 안에서 표시)
+# - 프로파일링 중인 호출이면 실행 스레드를 샘플러에 등록합니다 (등록 전 그 스레드의 샘플도 합쳐집니다)
+def _instrument(func):
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        capture = current_capture.get()
+        if capture is not None:
+            capture.attach_thread()
+        phase("input_check")
+        try:
+            return func(*args, **kwargs)
+        finally:
+            phase("serialize")
+    return wrapper
+
+# 선언 테이블 순서대로 MCP 도구를 등록합니다
+for _spec in TOOL_SPECS:
+    mcp.tool()(_instrument(_spec["func"]))
+
+TOOL_COSTS: Dict[str, str] = {spec["name"]: spec["cost"] for spec in TOOL_SPECS}
+
+# 승인 제어: 비용 등급별 동시 실행 예산과 대기열
+admission = AdmissionController()
+
+def _tool_name_from_path(path: str):
+    """도구 호출 경로(/mcp/call/{tool}, /tools/{tool})에서 도구 이름을 꺼냅니다."""
+    prefix, _, name = path.rpartition("/")
+    if prefix in ("/mcp/call", "/tools") and name in TOOL_COSTS:
+        return name
+    return None
+
+# 미들웨어는 나중에 등록된 것이 바깥쪽에서 실행됩니다.
+# 실행 순서: 압축 → 본문 크기 제한 → 트레이싱 → 승인 제어 → 프로파일링 → 도구
+# 프로파일링은 승인 제어 안쪽에서 시작되어 대기열 대기 시간은 포함하지 않고,
+# 프레임워크의 본문 읽기와 인자 검증은 포함합니다.
+# 본문 크기 제한은 트레이싱 바깥에서 거절하므로 400/413 응답은 트레이스에 남지 않습니다.
+
+# 무장된 도구 호출 샘플링 (가장 안쪽 미들웨어)
+mcp.app.add_middleware(ProfilingMiddleware, profiler=profiler, tool_for_path=_tool_name_from_path)
+
+# 비용 등급별 실행 슬롯 배정 (대기열이 차면 429, 대기 시간 초과 시 503)
+mcp.app.add_middleware(
+    AdmissionMiddleware,
+    controller=admission,
+    tool_for_path=_tool_name_from_path,
+    costs=TOOL_COSTS
+)
+
+# 도구 호출별 단계 트레이스와 X-Trace-Id, Server-Timing 헤더
+mcp.app.add_middleware(TracingMiddleware, sink=trace_sink, tool_for_path=_tool_name_from_path)
+
+# 요청 본문 크기 제한 (Content-Length가 없는 chunked 업로드는 읽은 바이트 수로 검사)
+mcp.app.add_middleware(BodySizeLimitMiddleware, controller=admission, tool_for_path=_tool_name_from_path)
+
+# 응답 압축 협상 및 압축된 요청 본문 해제 (가장 바깥쪽 미들웨어)
+# 해제된 본문 기준으로 Content-Length가 다시 설정되므로 승인 제어의 크기 검사도 해제 후 크기에 적용됩니다.
+mcp.app.add_middleware(
+    CompressionMiddleware,
+    minimum_size=COMPRESS_MIN_BYTES,
+    max_body_bytes=MAX_BODY_BYTES
+)
+
 # 서버 정보 및 상태 확인 (사람 확인용 - 선택사항)
 @mcp.app.get("/")
 async def root():
@@ -261,71 +784,12 @@ async def root():
         "status": "running",
         "available_tools": [
             {
-                "name": "add",
-                "description": "두 숫자 더하기",
-                "endpoint": "/tools/add",
-                "example": {"a": 10, "b": 5}
-            },
-            {
-                "name": "subtract", 
-                "description": "두 숫자 빼기",
-                "endpoint": "/tools/subtract",
-                "example": {"a": 10, "b": 3}
-            },
-            {
-                "name": "multiply",
-                "description": "두 숫자 곱하기",
-                "endpoint": "/tools/multiply",
-                "example": {"a": 6, "b": 7}
-            },
-            {
-                "name": "divide",
-                "description": "두 숫자 나누기",
-                "endpoint": "/tools/divide",
-                "example": {"a": 20, "b": 4}
-            },
-            {
-                "name": "calculate",
-                "description": "지정된 연산 수행",
-                "endpoint": "/tools/calculate",
-                "example": {"operation": "add", "a": 15, "b": 25}
-            },
-            {
-                "name": "statistics_basic",
-                "description": "기본 통계 계산 (개수, 합계, 평균, 최대값, 최소값)",
-                "endpoint": "/tools/statistics_basic",
-                "example": {"numbers": [1, 2, 3, 4, 5]}
-            },
-            {
-                "name": "statistics_advanced",
-                "description": "고급 통계 계산 (중앙값, 표준편차, 분산)",
-                "endpoint": "/tools/statistics_advanced",
-                "example": {"numbers": [1, 2, 3, 4, 5]}
-            },
-            {
-                "name": "statistics_full",
-                "description": "전체 통계 계산 (모든 통계)",
-                "endpoint": "/tools/statistics_full",
-                "example": {"numbers": [1, 2, 3, 4, 5]}
-            },
-            {
-                "name": "power",
-                "description": "거듭제곱 계산",
-                "endpoint": "/tools/power",
-                "example": {"base": 2, "exponent": 3}
-            },
-            {
-                "name": "square_root",
-                "description": "제곱근 계산",
-                "endpoint": "/tools/square_root",
-                "example": {"number": 16}
-            },
-            {
-                "name": "factorial",
-                "description": "팩토리얼 계산",
-                "endpoint": "/tools/factorial",
-                "example": {"n": 5}
+                "name": spec["name"],
+                "description": spec["summary"],
+                "endpoint": f"/tools/{spec['name']}",
+                "example": spec["example"]
             }
+            for spec in TOOL_SPECS
         ],
         "mcp_endpoints": {
             "tools_list": "/.well-known/mcp/tools",
@@ -334,15 +798,36 @@ async def root():
         }
     }
 
-# 서버 상태 확인 (사람 확인용 - 선택사항)
+# 이벤트 루프 지연 감시기는 서버가 시작될 때 띄우고 종료될 때 멈춥니다
+# 앱에 이미 있는 lifespan을 감싸서, 그 안의 시작/종료 처리도 그대로 실행됩니다
+_app_lifespan = mcp.app.router.lifespan_context
+
+@contextlib.asynccontextmanager
+async def _lifespan(app):
+    loop_monitor.start()
+    try:
+        async with _app_lifespan(app) as state:
+            yield state
+    finally:
+        await loop_monitor.stop()
+
+mcp.app.router.lifespan_context = _lifespan
+
+# 서버 상태 확인
+# 이벤트 루프 지연, 실행/대기 중인 도구 호출 수, 워커 풀 대기열로 healthy/degraded/unready를 판정합니다.
 @mcp.app.get("/health")
 async def health_check():
-    """서버 상태를 확인합니다."""
-    return {
-        "status": "healthy",
-        "timestamp": "2024-01-01T00:00:00Z",
-        "uptime": "running"
-    }
+    """서버 상태와 지표별 판정 결과를 반환합니다 (항상 200)."""
+    return loop_monitor.check(admission.snapshot)
+
+# 준비 상태 확인 (로드 밸런서용) - unready이면 503을 반환해서 트래픽을 다른 노드로 돌립니다
+@mcp.app.get("/ready")
+async def readiness_check():
+    """unready이면 503, healthy/degraded이면 200을 반환합니다."""
+    report = loop_monitor.check(admission.snapshot)
+    if report["status"] == UNREADY:
+        return JSONResponse(status_code=503, content=report, headers={"Retry-After": "1"})
+    return report
 
 # 사용 가능한 도구 목록 (사람 확인용 - 선택사항)
 @mcp.app.get("/tools")
@@ -350,89 +835,11 @@ async def list_tools():
     """사용 가능한 모든 도구 목록을 반환합니다."""
     tools_info = [
         {
-            "name": "add",
-            "description": "두 숫자를 더합니다",
-            "parameters": {
-                "a": {"type": "float", "description": "첫 번째 숫자"},
-                "b": {"type": "float", "description": "두 번째 숫자"}
-            }
-        },
-        {
-            "name": "subtract",
-            "description": "두 숫자를 뺍니다",
-            "parameters": {
-                "a": {"type": "float", "description": "첫 번째 숫자"},
-                "b": {"type": "float", "description": "두 번째 숫자"}
-            }
-        },
-        {
-            "name": "multiply",
-            "description": "두 숫자를 곱합니다",
-            "parameters": {
-                "a": {"type": "float", "description": "첫 번째 숫자"},
-                "b": {"type": "float", "description": "두 번째 숫자"}
-            }
-        },
-        {
-            "name": "divide",
-            "description": "두 숫자를 나눕니다",
-            "parameters": {
-                "a": {"type": "float", "description": "첫 번째 숫자"},
-                "b": {"type": "float", "description": "두 번째 숫자"}
-            }
-        },
-        {
-            "name": "calculate",
-            "description": "지정된 연산을 수행합니다",
-            "parameters": {
-                "operation": {"type": "string", "description": "연산 종류 (add/subtract/multiply/divide)"},
-                "a": {"type": "float", "description": "첫 번째 숫자"},
-                "b": {"type": "float", "description": "두 번째 숫자"}
-            }
-        },
-        {
-            "name": "statistics_basic",
-            "description": "기본 통계를 계산합니다",
-            "parameters": {
-                "numbers": {"type": "array", "description": "숫자 목록 (예: [1, 2, 3, 4, 5])"}
-            }
-        },
-        {
-            "name": "statistics_advanced",
-            "description": "고급 통계를 계산합니다",
-            "parameters": {
-                "numbers": {"type": "array", "description": "숫자 목록 (최소 2개 이상)"}
-            }
-        },
-        {
-            "name": "statistics_full",
-            "description": "전체 통계를 계산합니다",
-            "parameters": {
-                "numbers": {"type": "array", "description": "숫자 목록"}
-            }
-        },
-        {
-            "name": "power",
-            "description": "거듭제곱을 계산합니다",
-            "parameters": {
-                "base": {"type": "float", "description": "밑수"},
-                "exponent": {"type": "float", "description": "지수"}
-            }
-        },
-        {
-            "name": "square_root",
-            "description": "제곱근을 계산합니다",
-            "parameters": {
-                "number": {"type": "float", "description": "양수"}
-            }
-        },
-        {
-            "name": "factorial",
-            "description": "팩토리얼을 계산합니다",
-            "parameters": {
-                "n": {"type": "integer", "description": "0 이상 20 이하의 정수"}
-            }
+            "name": spec["name"],
+            "description": spec["description"],
+            "parameters": spec["parameters"]
         }
+        for spec in TOOL_SPECS
     ]
     
     return {
@@ -441,6 +848,55 @@ async def list_tools():
         "note": "이 엔드포인트는 사람 확인용입니다. MCP 에이전트는 /.well-known/mcp/tools를 사용합니다."
     }
 
+# 승인 제어 상태 (대기열 깊이, 거절 횟수 등)
+@mcp.app.get("/admin/admission")
+async def admission_status():
+    """비용 등급별 실행/대기 중인 호출 수와 거절 횟수를 반환합니다."""
+    return admission.snapshot()
+
+# 샘플링 프로파일러 상태 (무장된 도구, 수집된 샘플 수)
+@mcp.app.get("/admin/profile")
+async def profile_status():
+    """프로파일러 상태를 반환합니다."""
+    return profiler.snapshot()
+
+# 지정한 도구의 다음 N회 호출을 프로파일링하도록 무장합니다
+@mcp.app.post("/admin/profile/{tool}")
+async def profile_arm(tool: str, calls: int = 1):
+    """도구의 다음 calls회 호출을 샘플링합니다."""
+    if tool not in TOOL_COSTS:
+        return JSONResponse(status_code=404, content={"detail": f"알 수 없는 도구입니다: {tool}"})
+    if calls < 1:
+        return JSONResponse(status_code=422, content={"detail": "calls는 1 이상이어야 합니다."})
+    profiler.arm(tool, calls)
+    return {"tool": tool, "calls": calls, "download": f"/admin/profile/{tool}/stacks"}
+
+# folded 형식 스택 다운로드 (flamegraph.pl, speedscope 호환)
+@mcp.app.get("/admin/profile/{tool}/stacks")
+async def profile_stacks(tool: str):
+    """도구 호출에서 수집한 스택을 내려받습니다. tool이 background이면 상시 샘플러의 스택입니다."""
+    folded = profiler.folded(None if tool == "background" else tool)
+    return PlainTextResponse(
+        folded,
+        headers={"Content-Disposition": f'attachment; filename="{tool}.folded"'}
+    )
+
+# 수집된 스택 초기화
+@mcp.app.delete("/admin/profile/{tool}/stacks")
+async def profile_clear(tool: str):
+    """수집된 스택을 비웁니다."""
+    profiler.clear(None if tool == "background" else tool)
+    return {"tool": tool, "cleared": True}
+
+# 최근 트레이스 중 가장 느린 호출 조회
+@mcp.app.get("/admin/traces")
+async def slowest_traces(limit: int = 10, tool: str = None):
+    """링 버퍼에 남아 있는 트레이스 중 전체 시간이 가장 긴 호출을 반환합니다."""
+    return {
+        "buffered": len(trace_sink),
+        "traces": trace_sink.slowest(limit, tool)
+    }
+
 if __name__ == "__main__":
     import uvicorn
     print("🚀 계산기 MCP 서버를 시작합니다...")
@@ -0,0 +1,200 @@
+"""
+NumPy 기반 배열 커널
+
+mcp_server에서 `_lazy_import("numeric")`으로 처음 사용할 때 불러옵니다.
+원소별 커널은 (결과 배열, 정의역 오류 마스크)를 반환하며, 오류가 난 원소는 NaN으로 채웁니다.
+전체 호출을 실패시키지 않고 원소 단위로 오류를 보고하기 위함입니다.
+선형대수 커널은 NumPy(BLAS/LAPACK)를 사용하며 특이 행렬 등은 ValueError로 보고합니다.
+"""
+import base64
+import math
+from typing import Any, Dict, List, Optional
+
+# BLAS 스레드 수(MCP_BLAS_THREADS)는 NumPy보다 먼저 적용해야 합니다
+import blas_threads
+import numpy as np
+
+# 배열 결과 인코딩
+ENCODINGS = ("list", "base64")
+
+# 0! ~ 20! 조회 테이블 (float64로 정확히 표현 가능한 범위)
+_FACTORIALS = np.array([math.factorial(i) for i in range(21)], dtype=np.float64)
+
+
+def as_float_array(values) -> np.ndarray:
+    return np.asarray(values, dtype=np.float64)
+
+
+def power(bases: List[float], exponent) -> tuple:
+    """원소별 거듭제곱. exponent는 스칼라 또는 bases와 같은 길이의 목록입니다."""
+    b = as_float_array(bases)
+    e = as_float_array(exponent)
+    try:
+        np.broadcast_shapes(b.shape, e.shape)
+    except ValueError:
+        raise ValueError(f"지수 목록의 길이({e.size})가 밑수 목록의 길이({b.size})와 맞지 않습니다.")
+    with np.errstate(all="ignore"):
+        result = np.power(b, e)
+    # 유한한 입력에서 NaN/무한대가 나오면 정의역 오류 (음수의 분수 거듭제곱, 0의 음수 거듭제곱, 오버플로)
+    invalid = ~np.isfinite(result) & np.isfinite(b) & np.isfinite(e)
+    result[invalid] = np.nan
+    return result, invalid
+
+
+def square_root(numbers: List[float]) -> tuple:
+    """원소별 제곱근. 음수는 정의역 오류로 표시합니다."""
+    x = as_float_array(numbers)
+    invalid = x < 0
+    with np.errstate(invalid="ignore"):
+        result = np.sqrt(x)
+    return result, invalid
+
+
+def factorial(ns: List[int]) -> tuple:
+    """원소별 팩토리얼. 0 이상 20 이하가 아니면 정의역 오류로 표시합니다."""
+    # float64로 변환한 뒤 범위를 검사합니다. float64로도 표현할 수 없는 큰 정수는
+    # 범위 밖 값(-1 또는 21)으로 잘라서 변환합니다 (오류 원소로 표시됨)
+    try:
+        n = as_float_array(ns)
+    except OverflowError:
+        n = as_float_array([min(max(v, -1), 21) for v in ns])
+    invalid = (n < 0) | (n > 20)
+    result = np.full(n.shape, np.nan)
+    valid = ~invalid
+    result[valid] = _FACTORIALS[n[valid].astype(np.int64)]
+    return result, invalid
+
+
+def encode_array(array: np.ndarray, encoding: str) -> Dict[str, Any]:
+    """배열을 응답 형식으로 인코딩합니다.
+
+    - list: 행 우선(C 순서)으로 평탄화한 JSON 숫자 목록 (NaN/무한대는 null)
+    - base64: little-endian float64 버퍼를 base64로 인코딩한 문자열
+
+    두 형식 모두 1차원 값이며 원래 모양은 shape로 전달합니다.
+    """
+    if encoding == "base64":
+        buffer = np.ascontiguousarray(array, dtype="<f8").tobytes()
+        values: Any = base64.b64encode(buffer).decode("ascii")
+    else:
+        flat = array.ravel()
+        values = flat.astype(object)
+        values[~np.isfinite(flat)] = None
+        values = values.tolist()
+    return {
+        "shape": list(array.shape),
+        "dtype": "float64",
+        "encoding": encoding,
+        "values": values
+    }
+
+
+def nonfinite(array: np.ndarray) -> np.ndarray:
+    """NaN 또는 무한대인 원소의 마스크"""
+    return ~np.isfinite(array)
+
+
+def mask_indices(mask: np.ndarray) -> List[int]:
+    """오류 마스크를 평탄화한 인덱스 목록으로 바꿉니다."""
+    return np.flatnonzero(mask).tolist()
+
+
+# --- 선형대수 ---
+
+def decode_array(value, name: str, max_elements: int) -> np.ndarray:
+    """중첩 목록 또는 packed float64 버퍼({shape, values})를 배열로 바꿉니다."""
+    if hasattr(value, "shape") and hasattr(value, "values") and isinstance(value.values, str):
+        shape = tuple(value.shape)
+        try:
+            buffer = base64.b64decode(value.values, validate=True)
+        except ValueError:
+            raise ValueError(f"{name}의 base64 버퍼를 해석할 수 없습니다.")
+        expected = math.prod(shape) * 8
+        if len(buffer) != expected:
+            raise ValueError(f"{name}의 버퍼 크기({len(buffer)} bytes)가 shape {list(shape)}와 맞지 않습니다 (예상 {expected} bytes).")
+        array = np.frombuffer(buffer, dtype="<f8").reshape(shape)
+    else:
+        try:
+            array = np.asarray(value, dtype=np.float64)
+        except ValueError:
+            raise ValueError(f"{name}의 각 행 길이가 같아야 합니다.")
+    if array.size == 0:
+        raise ValueError(f"{name}이(가) 비어있습니다.")
+    if array.size > max_elements:
+        raise ValueError(f"{name}의 원소 수({array.size})가 최대 {max_elements}개를 초과했습니다.")
+    if not np.all(np.isfinite(array)):
+        raise ValueError(f"{name}에 NaN 또는 무한대가 포함되어 있습니다.")
+    return array
+
+
+def _require_matrix(array: np.ndarray, name: str, square: bool = False) -> None:
+    if array.ndim != 2:
+        raise ValueError(f"{name}은(는) 2차원 행렬이어야 합니다 (현재 {array.ndim}차원).")
+    if square and array.shape[0] != array.shape[1]:
+        raise ValueError(f"{name}은(는) 정사각 행렬이어야 합니다 (현재 {array.shape[0]}×{array.shape[1]}).")
+
+
+def _require_rhs(a: np.ndarray, b: np.ndarray) -> None:
+    if b.ndim not in (1, 2) or b.shape[0] != a.shape[0]:
+        raise ValueError(f"b의 행 수({b.shape[0] if b.ndim else 0})가 A의 행 수({a.shape[0]})와 같아야 합니다.")
+
+
+def matmul(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """행렬 곱 A @ B"""
+    _require_matrix(a, "A")
+    if b.ndim not in (1, 2):
+        raise ValueError("B는 벡터 또는 2차원 행렬이어야 합니다.")
+    if a.shape[1] != b.shape[0]:
+        raise ValueError(f"A의 열 수({a.shape[1]})와 B의 행 수({b.shape[0]})가 같아야 합니다.")
+    return a @ b
+
+
+def solve(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """연립방정식 A x = b의 해"""
+    _require_matrix(a, "A", square=True)
+    _require_rhs(a, b)
+    try:
+        return np.linalg.solve(a, b)
+    except np.linalg.LinAlgError:
+        raise ValueError("A가 특이 행렬이라 해를 구할 수 없습니다. least_squares를 사용해보세요.")
+
+
+def determinant(a: np.ndarray) -> np.ndarray:
+    """행렬식 (1원소 배열로 반환)"""
+    _require_matrix(a, "A", square=True)
+    # 오버플로는 결과의 무한대로 드러나며 오류 마스크로 보고됩니다
+    with np.errstate(over="ignore"):
+        return np.array([np.linalg.det(a)])
+
+
+def inverse(a: np.ndarray) -> np.ndarray:
+    """역행렬"""
+    _require_matrix(a, "A", square=True)
+    try:
+        return np.linalg.inv(a)
+    except np.linalg.LinAlgError:
+        raise ValueError("A가 특이 행렬이라 역행렬이 없습니다.")
+
+
+def least_squares(a: np.ndarray, b: np.ndarray) -> tuple:
+    """최소제곱해 argmin ||A x - b||와 (rank, 잔차 제곱합, 조건수)"""
+    _require_matrix(a, "A")
+    _require_rhs(a, b)
+    x, residuals, rank, singular_values = np.linalg.lstsq(a, b, rcond=None)
+    if residuals.size:
+        residual = float(residuals.sum())
+    else:
+        # rank가 부족하거나 정방 행렬이면 lstsq가 잔차를 돌려주지 않으므로 직접 계산합니다
+        residual = float(np.sum((a @ x - b) ** 2))
+    smallest = singular_values[-1] if singular_values.size else 0.0
+    details = {
+        "rank": float(rank),
+        "residual_sum_of_squares": residual,
+        "condition_number": float(singular_values[0] / smallest) if smallest > 0 else None
+    }
+    return x, details
+
+
+def blas_info() -> Dict[str, Optional[str]]:
+    """설정된 BLAS 스레드 수와 적용 방식을 반환합니다."""
+    return blas_threads.info()
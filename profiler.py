@@ -0,0 +1,289 @@
+"""
+도구 호출용 샘플링 프로파일러
+
+- 특정 도구의 다음 N회 호출을 높은 빈도로 샘플링합니다.
+  `MCP_PROFILE_ALLOW_HEADER`를 켜면 `X-MCP-Profile` 헤더가 붙은 호출도 샘플링합니다.
+- 모든 스레드를 낮은 빈도(`MCP_PROFILE_SAMPLE_HZ`, 기본 10Hz)로 상시 샘플링합니다. 0이면 끕니다.
+
+캡처는 프레임워크가 본문을 읽고 인자를 검증하기 전에 시작됩니다. 도구가 스레드 풀에서
+실행되면 그 스레드가 등록되기 전까지의 샘플을 스레드별로 보관했다가, 도구를 실행한
+스레드의 것만 캡처에 합칩니다. 그래서 워커 스레드에서 일어난 인자 검증도 샘플에 포함됩니다.
+
+수집된 스택은 flamegraph.pl / speedscope 등이 읽을 수 있는 folded 형식
+(`프레임1;프레임2;프레임3 횟수`)으로 내려받을 수 있습니다.
+무장된 호출이 없으면 요청당 비용은 dict 조회 한 번입니다.
+"""
+import contextvars
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from typing import Any, Callable, Dict, Optional
+
+# 고유 스택 수 상한 (메모리 보호)
+MAX_UNIQUE_STACKS = 10_000
+
+# 블로킹 대기 중인 스레드의 최상위 프레임 (샘플에서 제외)
+_IDLE_FRAMES = {
+    "selectors.py:select",
+    "threading.py:wait",
+    "threading.py:_wait_for_tstate_lock",
+    "queue.py:get",
+    "thread.py:_worker",
+}
+
+# 현재 요청에 대해 진행 중인 캡처 (도구 함수가 실행 스레드를 등록할 때 사용)
+current_capture: contextvars.ContextVar[Optional["CallCapture"]] = contextvars.ContextVar(
+    "current_capture", default=None
+)
+
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    module = frame.f_globals.get("__name__", "?")
+    return f"{module}:{getattr(code, 'co_qualname', code.co_name)}"
+
+
+def _is_idle(frame) -> bool:
+    code = frame.f_code
+    return f"{os.path.basename(code.co_filename)}:{code.co_name}" in _IDLE_FRAMES
+
+
+def _fold(frame) -> str:
+    """프레임 체인을 루트부터 `;`로 이은 folded 스택 문자열로 만듭니다."""
+    labels = []
+    while frame is not None:
+        labels.append(_frame_label(frame))
+        frame = frame.f_back
+    return ";".join(reversed(labels))
+
+
+class StackTable:
+    """folded 스택별 샘플 수를 모읍니다."""
+
+    def __init__(self):
+        self.counts: Counter = Counter()
+        self.samples = 0
+        self.dropped = 0
+
+    def add(self, stack: str, count: int = 1) -> None:
+        if stack not in self.counts and len(self.counts) >= MAX_UNIQUE_STACKS:
+            self.dropped += count
+            return
+        self.counts[stack] += count
+        self.samples += count
+
+    def merge(self, other: "StackTable") -> None:
+        for stack, count in other.counts.items():
+            self.add(stack, count)
+
+    def folded(self) -> str:
+        return "".join(f"{stack} {count}\n" for stack, count in self.counts.most_common())
+
+
+class CallCapture:
+    """도구 호출 한 번 동안 샘플링할 스레드와 수집된 스택을 보관합니다."""
+
+    def __init__(self, tool: str, lock: threading.Lock):
+        self.tool = tool
+        self.threads = {threading.get_ident()}
+        self.stacks = StackTable()
+        # 워커 스레드가 등록되기 전의 샘플 (스레드 ID별)
+        self.pending: Optional[Dict[int, StackTable]] = {}
+        self._lock = lock
+
+    def attach_thread(self) -> None:
+        """도구 함수가 다른 스레드(스레드 풀)에서 실행될 때 그 스레드를 등록합니다.
+
+        등록 전에 이 스레드에서 모인 샘플(인자 검증 등)을 캡처에 합치고 나머지는 버립니다.
+        """
+        thread_id = threading.get_ident()
+        with self._lock:
+            self.threads.add(thread_id)
+            if self.pending is not None:
+                earlier = self.pending.get(thread_id)
+                if earlier is not None:
+                    self.stacks.merge(earlier)
+                self.pending = None
+
+
+class SamplingProfiler:
+    """무장(arm)된 도구 호출과 상시 샘플링을 처리하는 단일 샘플러 스레드"""
+
+    def __init__(self, capture_hz: float, background_hz: float, allow_header: bool = False):
+        self.capture_interval = 1.0 / capture_hz
+        self.background_hz = background_hz
+        self.allow_header = allow_header
+        self.armed: Dict[str, int] = {}
+        self.tool_stacks: Dict[str, StackTable] = {}
+        self.background = StackTable()
+        self._active: Dict[int, CallCapture] = {}
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        if background_hz > 0:
+            self._ensure_thread()
+
+    # --- 요청 경로 ---
+
+    def wants(self, tool: str, header: Optional[str]) -> bool:
+        """이번 호출을 프로파일링할지 결정합니다 (비활성 시 dict 조회 한 번)."""
+        if header is not None and self.allow_header and header not in ("0", ""):
+            return True
+        if not self.armed:
+            return False
+        with self._lock:
+            remaining = self.armed.get(tool, 0)
+            if remaining <= 0:
+                return False
+            if remaining == 1:
+                del self.armed[tool]
+            else:
+                self.armed[tool] = remaining - 1
+            return True
+
+    def start_capture(self, tool: str) -> CallCapture:
+        capture = CallCapture(tool, self._lock)
+        with self._lock:
+            self._active[id(capture)] = capture
+        self._ensure_thread()
+        self._wakeup.set()
+        return capture
+
+    def finish_capture(self, capture: CallCapture) -> None:
+        with self._lock:
+            self._active.pop(id(capture), None)
+            self.tool_stacks.setdefault(capture.tool, StackTable()).merge(capture.stacks)
+
+    # --- 관리 ---
+
+    def arm(self, tool: str, calls: int) -> None:
+        # 0 이하로 무장하면 항목이 지워지지 않아 wants()가 계속 잠금을 잡게 됩니다
+        if calls < 1:
+            raise ValueError("calls는 1 이상이어야 합니다.")
+        with self._lock:
+            self.armed[tool] = calls
+
+    def clear(self, tool: Optional[str] = None) -> None:
+        with self._lock:
+            if tool is None:
+                self.background = StackTable()
+            else:
+                self.tool_stacks.pop(tool, None)
+
+    def folded(self, tool: Optional[str] = None) -> str:
+        with self._lock:
+            table = self.background if tool is None else self.tool_stacks.get(tool, StackTable())
+            return table.folded()
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "armed": dict(self.armed),
+                "active_captures": len(self._active),
+                "background_hz": self.background_hz,
+                "allow_header": self.allow_header,
+                "background_samples": self.background.samples,
+                "tool_samples": {tool: table.samples for tool, table in self.tool_stacks.items()},
+                "sampler_running": self._thread is not None
+            }
+
+    # --- 샘플러 스레드 ---
+
+    def _ensure_thread(self) -> None:
+        if self._thread is None:
+            with self._lock:
+                if self._thread is None:
+                    self._thread = threading.Thread(
+                        target=self._run, name="mcp-sampling-profiler", daemon=True
+                    )
+                    self._thread.start()
+
+    def _run(self) -> None:
+        own_thread = threading.get_ident()
+        background_interval = 1.0 / self.background_hz if self.background_hz > 0 else None
+        next_background = time.monotonic()
+        while True:
+            with self._lock:
+                active = list(self._active.values())
+            if not active and background_interval is None:
+                # 캡처가 없으면 다음 캡처가 시작될 때까지 잠듭니다
+                self._wakeup.wait()
+                self._wakeup.clear()
+                continue
+
+            frames = sys._current_frames()
+            now = time.monotonic()
+            with self._lock:
+                # 잠금 안에서 기록해야 finish_capture()의 병합과 겹치지 않습니다
+                for capture in self._active.values():
+                    for thread_id in capture.threads:
+                        frame = frames.get(thread_id)
+                        if frame is not None and not _is_idle(frame):
+                            capture.stacks.add(_fold(frame))
+                    if capture.pending is not None:
+                        # 어느 워커가 도구를 실행할지 아직 모르므로 바쁜 스레드를 모두 보관합니다
+                        for thread_id, frame in frames.items():
+                            if thread_id != own_thread and thread_id not in capture.threads and not _is_idle(frame):
+                                capture.pending.setdefault(thread_id, StackTable()).add(_fold(frame))
+
+                if background_interval is not None and now >= next_background:
+                    next_background = now + background_interval
+                    for thread_id, frame in frames.items():
+                        if thread_id != own_thread and not _is_idle(frame):
+                            self.background.add(_fold(frame))
+
+            del frames
+            if active:
+                time.sleep(self.capture_interval)
+            else:
+                self._wakeup.wait(max(0.0, next_background - time.monotonic()))
+                self._wakeup.clear()
+
+
+class ProfilingMiddleware:
+    """무장된 도구 호출을 샘플링하는 ASGI 미들웨어
+
+    샘플링한 호출의 응답에는 `X-MCP-Profile-Samples` 헤더(응답 시작 시점까지의 샘플 수)가 붙습니다.
+    """
+
+    def __init__(self, app, profiler: SamplingProfiler, tool_for_path: Callable[[str], Optional[str]]):
+        self.app = app
+        self.profiler = profiler
+        self.tool_for_path = tool_for_path
+
+    async def __call__(self, scope, receive, send):
+        tool = None
+        if scope["type"] == "http" and scope["method"] == "POST":
+            tool = self.tool_for_path(scope["path"])
+        header = None
+        if tool is not None and self.profiler.allow_header:
+            header = next(
+                (value.decode("latin-1") for key, value in scope["headers"] if key == b"x-mcp-profile"), None
+            )
+        if tool is None or not self.profiler.wants(tool, header):
+            await self.app(scope, receive, send)
+            return
+
+        capture = self.profiler.start_capture(tool)
+
+        async def send_with_samples(message):
+            if message["type"] == "http.response.start":
+                samples = str(capture.stacks.samples).encode()
+                message["headers"] = [*message.get("headers", []), (b"x-mcp-profile-samples", samples)]
+            await send(message)
+
+        token = current_capture.set(capture)
+        try:
+            await self.app(scope, receive, send_with_samples)
+        finally:
+            current_capture.reset(token)
+            self.profiler.finish_capture(capture)
+
+
+profiler = SamplingProfiler(
+    capture_hz=float(os.environ.get("MCP_PROFILE_CAPTURE_HZ", "1000")),
+    background_hz=float(os.environ.get("MCP_PROFILE_SAMPLE_HZ", "10")),
+    allow_header=os.environ.get("MCP_PROFILE_ALLOW_HEADER", "0") not in ("0", "")
+)
@@ -1,5 +1,8 @@
 import requests
+import base64
+import gzip
 import json
+import struct
 import time
 
 # 서버 기본 URL
@@ -43,10 +46,26 @@ def test_health_check():
             print("✅ 서버 상태 확인 성공")
             print(f"  상태: {data.get('status')}")
             print(f"  타임스탬프: {data.get('timestamp')}")
+            print(f"  가동 시간: {data.get('uptime')}초")
+            for name, check in data.get('checks', {}).items():
+                print(f"  {name}: {check['value']} ({check['status']})")
+            if not data.get('monitor', {}).get('running'):
+                print("  ❌ 이벤트 루프 감시기가 실행 중이 아닙니다")
         else:
             print(f"❌ 서버 상태 확인 실패: {response.status_code}")
     except Exception as e:
         print(f"❌ 서버 상태 확인 오류: {e}")
+    
+    # 준비 상태: unready일 때만 503
+    try:
+        response = requests.get(f"{BASE_URL}/ready")
+        status = response.json().get('status')
+        if (response.status_code == 503) == (status == "unready"):
+            print(f"✅ 준비 상태 확인: {response.status_code} ({status})")
+        else:
+            print(f"❌ 준비 상태 응답 불일치: {response.status_code} ({status})")
+    except Exception as e:
+        print(f"❌ 준비 상태 확인 오류: {e}")
 
 def test_mcp_standard_endpoints():
     """MCP 표준 엔드포인트 테스트"""
@@ -155,6 +174,24 @@ def test_calculate_tool():
                 print(f"  오류: {response.text}")
         except Exception as e:
             print(f"  ❌ 오류: {e}")
+    
+    # message 생략 테스트
+    print("\nmessage 생략 테스트:")
+    try:
+        response = requests.post(
+            f"{BASE_URL}/mcp/call/calculate",
+            headers={"Content-Type": "application/json"},
+            data=json.dumps({"operation": "multiply", "a": 8, "b": 9, "include_message": False})
+        )
+        
+        if response.status_code == 200:
+            data = response.json()
+            print(f"  ✅ 성공: 결과={data.get('result')}, message={data.get('message')!r} (예상: '')")
+        else:
+            print(f"  ❌ 실패: {response.status_code}")
+            print(f"  오류: {response.text}")
+    except Exception as e:
+        print(f"  ❌ 오류: {e}")
 
 def test_statistics_tools():
     """통계 계산 도구들 테스트 (MCP 표준 엔드포인트 사용)"""
@@ -298,6 +335,172 @@ def test_math_functions():
     except Exception as e:
         print(f"  ❌ 오류: {e}")
 
+def test_vector_functions():
+    """배열 수학 함수 도구들 테스트 (MCP 표준 엔드포인트 사용)"""
+    print("\n📐 배열 수학 함수 도구 테스트 (MCP 표준 엔드포인트)")
+    print("-" * 40)
+    
+    test_cases = [
+        ("power_vector", {"bases": [1, 2, 3, 4], "exponent": 2}, []),
+        ("power_vector", {"bases": [-8, 4], "exponent": [0.5, 0.5]}, [0]),
+        ("square_root_vector", {"numbers": [4, 9, -1, 16]}, [2]),
+        ("factorial_vector", {"numbers": [0, 5, 10, 25], "encoding": "base64"}, [3])
+    ]
+    
+    for tool_name, params, expected_invalid in test_cases:
+        print(f"\n{tool_name} 도구 테스트:")
+        try:
+            response = requests.post(
+                f"{BASE_URL}/mcp/call/{tool_name}",
+                headers={"Content-Type": "application/json"},
+                data=json.dumps(params)
+            )
+            
+            if response.status_code == 200:
+                data = response.json()
+                print(f"  ✅ 성공: {data.get('message')}")
+                print(f"  결과({data.get('encoding')}): {data.get('values')}")
+                print(f"  오류 위치: {data.get('invalid_indices')} (예상: {expected_invalid})")
+            else:
+                print(f"  ❌ 실패: {response.status_code}")
+                print(f"  오류: {response.text}")
+        except Exception as e:
+            print(f"  ❌ 오류: {e}")
+
+def test_linalg_tools():
+    """선형대수 도구들 테스트 (MCP 표준 엔드포인트 사용)"""
+    print("\n🧊 선형대수 도구 테스트 (MCP 표준 엔드포인트)")
+    print("-" * 40)
+    
+    identity = {"shape": [2, 2], "values": base64.b64encode(struct.pack("<4d", 1, 0, 0, 1)).decode("ascii")}
+    test_cases = [
+        ("matrix_multiply", {"a": [[1, 2], [3, 4]], "b": [[5, 6], [7, 8]]}, "[19, 22, 43, 50]"),
+        ("matrix_multiply", {"a": [[1, 2], [3, 4]], "b": identity}, "[1, 2, 3, 4] (packed 입력)"),
+        ("matrix_solve", {"a": [[3, 1], [1, 2]], "b": [9, 8]}, "[2, 3]"),
+        ("matrix_determinant", {"a": [[1, 2], [3, 4]]}, "[-2]"),
+        ("matrix_inverse", {"a": [[4, 7], [2, 6]]}, "[0.6, -0.7, -0.2, 0.4]"),
+        ("least_squares", {"a": [[1, 0], [1, 1], [1, 2]], "b": [1, 2, 2]}, "[1.1667, 0.5]")
+    ]
+    
+    for tool_name, params, expected in test_cases:
+        print(f"\n{tool_name} 도구 테스트:")
+        try:
+            response = requests.post(
+                f"{BASE_URL}/mcp/call/{tool_name}",
+                headers={"Content-Type": "application/json"},
+                data=json.dumps(params)
+            )
+            
+            if response.status_code == 200:
+                data = response.json()
+                print(f"  ✅ 성공: {data.get('message')}")
+                print(f"  결과: {data.get('values')} (예상: {expected})")
+                if data.get('details'):
+                    print(f"  세부 정보: {data.get('details')}")
+            else:
+                print(f"  ❌ 실패: {response.status_code}")
+                print(f"  오류: {response.text}")
+        except Exception as e:
+            print(f"  ❌ 오류: {e}")
+    
+    # 2차원 결과는 평탄화된 values와 shape로 반환
+    print("\n2차원 결과 형식 테스트:")
+    try:
+        response = requests.post(
+            f"{BASE_URL}/mcp/call/least_squares",
+            headers={"Content-Type": "application/json"},
+            data=json.dumps({"a": [[1, 0], [1, 1], [1, 2]], "b": [[1, 2], [2, 3], [2, 4]]})
+        )
+        data = response.json()
+        if response.status_code == 200 and data.get('shape') == [2, 2] and len(data.get('values', [])) == 4:
+            print(f"  ✅ shape {data['shape']}, values {data['values']}")
+        else:
+            print(f"  ❌ 예상치 못한 응답: {response.status_code} {response.text}")
+    except Exception as e:
+        print(f"  ❌ 오류: {e}")
+    
+    # 특이 행렬
+    print("\n특이 행렬 테스트:")
+    try:
+        response = requests.post(
+            f"{BASE_URL}/mcp/call/matrix_inverse",
+            headers={"Content-Type": "application/json"},
+            data=json.dumps({"a": [[1, 2], [2, 4]]})
+        )
+        if response.status_code == 422:
+            print("  ✅ 예상된 오류 발생 (특이 행렬)")
+        else:
+            print(f"  ❌ 예상치 못한 응답: {response.status_code}")
+    except Exception as e:
+        print(f"  ❌ 오류: {e}")
+
+def test_integration_tool():
+    """적분 도구 테스트 (MCP 표준 엔드포인트 사용)"""
+    print("\n∫ 적분 도구 테스트 (MCP 표준 엔드포인트)")
+    print("-" * 40)
+    
+    test_cases = [
+        ({"lower": 0, "upper": 3.141592653589793, "expression": "sin(x)", "seed": 42}, "≈ 2"),
+        ({"lower": 0, "upper": 3.141592653589793, "expression": "sin(x)", "method": "quadrature"}, "2"),
+        ({"lower": -1, "upper": 1, "distribution": "normal", "method": "quadrature"}, "0.6827"),
+        ({"lower": "-inf", "upper": "inf", "expression": "x**2", "distribution": "normal",
+          "parameters": {"std": 2}, "samples": 200000, "seed": 7}, "≈ 4")
+    ]
+    
+    for params, expected in test_cases:
+        print(f"\nintegrate {params.get('method', 'monte_carlo')} 테스트:")
+        try:
+            response = requests.post(
+                f"{BASE_URL}/mcp/call/integrate",
+                headers={"Content-Type": "application/json"},
+                data=json.dumps(params)
+            )
+            
+            if response.status_code == 200:
+                data = response.json()
+                print(f"  ✅ 성공: {data.get('message')}")
+                print(f"  추정값: {data.get('estimate')} ± {data.get('standard_error')} (예상: {expected})")
+                print(f"  워커: {data.get('workers')}, 평가 횟수: {data.get('evaluations')}, seed: {data.get('seed')}")
+            else:
+                print(f"  ❌ 실패: {response.status_code}")
+                print(f"  오류: {response.text}")
+        except Exception as e:
+            print(f"  ❌ 오류: {e}")
+    
+    # 같은 seed는 같은 결과
+    print("\n시드 재현성 테스트:")
+    try:
+        params = {"lower": 0, "upper": 1, "expression": "exp(x)", "samples": 100000, "seed": 123}
+        estimates = [
+            requests.post(
+                f"{BASE_URL}/mcp/call/integrate",
+                headers={"Content-Type": "application/json"},
+                data=json.dumps(params)
+            ).json().get("estimate")
+            for _ in range(2)
+        ]
+        if estimates[0] is not None and estimates[0] == estimates[1]:
+            print(f"  ✅ 같은 seed에서 같은 추정값: {estimates[0]}")
+        else:
+            print(f"  ❌ 추정값이 다릅니다: {estimates}")
+    except Exception as e:
+        print(f"  ❌ 오류: {e}")
+    
+    # 허용되지 않는 수식
+    print("\n허용되지 않는 수식 테스트:")
+    try:
+        response = requests.post(
+            f"{BASE_URL}/mcp/call/integrate",
+            headers={"Content-Type": "application/json"},
+            data=json.dumps({"lower": 0, "upper": 1, "expression": "__import__('os').getcwd()"})
+        )
+        if response.status_code == 422:
+            print("  ✅ 예상된 오류 발생 (허용되지 않는 수식)")
+        else:
+            print(f"  ❌ 예상과 다른 응답: {response.status_code}")
+    except Exception as e:
+        print(f"  ❌ 오류: {e}")
+
 def test_error_cases():
     """오류 케이스 테스트 (MCP 표준 엔드포인트 사용)"""
     print("\n⚠️ 오류 케이스 테스트 (MCP 표준 엔드포인트)")
@@ -363,6 +566,166 @@ def test_error_cases():
     except Exception as e:
         print(f"  ❌ 오류: {e}")
 
+def test_admission_control():
+    """승인 제어(입력 크기 제한, 상태 조회) 테스트"""
+    print("\n🚦 승인 제어 테스트")
+    print("-" * 40)
+    
+    # 승인 제어 상태 조회
+    print("승인 제어 상태 조회:")
+    try:
+        response = requests.get(f"{BASE_URL}/admin/admission")
+        if response.status_code == 200:
+            data = response.json()
+            print(f"  ✅ 성공: 최대 숫자 개수={data.get('max_numbers')}, 최대 본문 크기={data.get('max_body_bytes')}")
+            for name, stats in data.get('cost_classes', {}).items():
+                print(f"    - {name}: 실행 중={stats.get('in_flight')}, 대기열={stats.get('queue_depth')}, "
+                      f"거절={stats.get('rejected_queue_full') + stats.get('rejected_timeout')}")
+        else:
+            print(f"  ❌ 실패: {response.status_code}")
+    except Exception as e:
+        print(f"  ❌ 오류: {e}")
+    
+    # 최대 길이를 넘는 숫자 목록
+    print("\n최대 길이 초과 숫자 목록 테스트:")
+    try:
+        limit = requests.get(f"{BASE_URL}/admin/admission").json().get('max_numbers')
+        response = requests.post(
+            f"{BASE_URL}/mcp/call/statistics_full",
+            headers={"Content-Type": "application/json"},
+            data=json.dumps({"numbers": [1] * (limit + 1)})
+        )
+        if response.status_code in (413, 422):
+            print(f"  ✅ 예상된 거절 발생 ({response.status_code})")
+        else:
+            print(f"  ❌ 예상치 못한 응답: {response.status_code}")
+    except Exception as e:
+        print(f"  ❌ 오류: {e}")
+    
+    # Content-Length 없는 chunked 업로드 (제너레이터 본문)
+    print("\nchunked 업로드 테스트:")
+    try:
+        body = json.dumps({"numbers": [1, 2, 3, 4, 5]}).encode("utf-8")
+        response = requests.post(
+            f"{BASE_URL}/mcp/call/statistics_basic",
+            headers={"Content-Type": "application/json"},
+            data=(body[i:i + 8] for i in range(0, len(body), 8))
+        )
+        if response.status_code == 200:
+            print(f"  ✅ 성공: {response.json().get('message')}")
+        else:
+            print(f"  ❌ 예상치 못한 응답: {response.status_code}")
+    except Exception as e:
+        print(f"  ❌ 오류: {e}")
+
+def test_profiler():
+    """샘플링 프로파일러 테스트"""
+    print("\n🔬 샘플링 프로파일러 테스트")
+    print("-" * 40)
+    
+    try:
+        response = requests.post(f"{BASE_URL}/admin/profile/statistics_full", params={"calls": 1})
+        if response.status_code != 200:
+            print(f"  ❌ 프로파일러 무장 실패: {response.status_code}")
+            return
+        
+        response = requests.post(
+            f"{BASE_URL}/mcp/call/statistics_full",
+            headers={"Content-Type": "application/json"},
+            data=json.dumps({"numbers": list(range(50000))})
+        )
+        print(f"  ✅ 프로파일링된 호출: {response.status_code}, 샘플 {response.headers.get('X-MCP-Profile-Samples')}개")
+        
+        response = requests.get(f"{BASE_URL}/admin/profile/statistics_full/stacks")
+        if response.status_code == 200:
+            print(f"  ✅ folded 스택 다운로드 성공 ({len(response.text.splitlines())}개 스택)")
+        else:
+            print(f"  ❌ 스택 다운로드 실패: {response.status_code}")
+    except Exception as e:
+        print(f"  ❌ 오류: {e}")
+
+def test_tracing():
+    """단계별 트레이싱 테스트"""
+    print("\n⏱️ 단계별 트레이싱 테스트")
+    print("-" * 40)
+    
+    try:
+        response = requests.post(
+            f"{BASE_URL}/mcp/call/add",
+            headers={"Content-Type": "application/json"},
+            data=json.dumps({"a": 1, "b": 2})
+        )
+        trace_id = response.headers.get("X-Trace-Id")
+        if trace_id:
+            print(f"  ✅ 트레이스 ID: {trace_id}")
+            print(f"  Server-Timing: {response.headers.get('Server-Timing')}")
+        else:
+            print("  ❌ X-Trace-Id 헤더가 없습니다")
+        
+        response = requests.get(f"{BASE_URL}/admin/traces", params={"limit": 3})
+        if response.status_code == 200:
+            for trace in response.json().get('traces', []):
+                spans = ", ".join(f"{s['name']}={s['duration_ms']}ms" for s in trace['spans'])
+                print(f"  - {trace['tool']} {trace['total_ms']}ms: {spans}")
+        else:
+            print(f"  ❌ 트레이스 조회 실패: {response.status_code}")
+    except Exception as e:
+        print(f"  ❌ 오류: {e}")
+
+def test_compression():
+    """응답 압축 및 압축된 요청 본문 테스트"""
+    print("\n🗜️ 압축 테스트")
+    print("-" * 40)
+    
+    numbers = list(range(10000))
+    
+    # 큰 응답은 압축되어야 함
+    print("큰 응답 압축 테스트:")
+    try:
+        response = requests.post(
+            f"{BASE_URL}/mcp/call/statistics_full",
+            headers={"Content-Type": "application/json", "Accept-Encoding": "gzip"},
+            data=json.dumps({"numbers": numbers})
+        )
+        encoding = response.headers.get("Content-Encoding")
+        if response.status_code == 200 and encoding:
+            print(f"  ✅ 압축된 응답 ({encoding}): 평균={response.json()['results']['mean']}")
+        else:
+            print(f"  ❌ 예상치 못한 응답: {response.status_code}, Content-Encoding={encoding}")
+    except Exception as e:
+        print(f"  ❌ 오류: {e}")
+    
+    # 작은 응답은 압축하지 않음
+    print("\n작은 응답 압축 생략 테스트:")
+    try:
+        response = requests.post(
+            f"{BASE_URL}/mcp/call/add",
+            headers={"Content-Type": "application/json", "Accept-Encoding": "gzip"},
+            data=json.dumps({"a": 1, "b": 2})
+        )
+        if response.headers.get("Content-Encoding") is None:
+            print("  ✅ 작은 응답은 압축하지 않음")
+        else:
+            print(f"  ❌ 작은 응답이 압축됨: {response.headers.get('Content-Encoding')}")
+    except Exception as e:
+        print(f"  ❌ 오류: {e}")
+    
+    # gzip으로 압축한 요청 본문
+    print("\n압축된 요청 본문 테스트:")
+    try:
+        response = requests.post(
+            f"{BASE_URL}/mcp/call/statistics_basic",
+            headers={"Content-Type": "application/json", "Content-Encoding": "gzip"},
+            data=gzip.compress(json.dumps({"numbers": numbers}).encode("utf-8"))
+        )
+        if response.status_code == 200:
+            print(f"  ✅ 성공: {response.json().get('message')}")
+        else:
+            print(f"  ❌ 실패: {response.status_code}")
+            print(f"  오류: {response.text}")
+    except Exception as e:
+        print(f"  ❌ 오류: {e}")
+
 def test_api_documentation():
     """API 문서 접근 테스트"""
     print("\n📖 API 문서 접근 테스트")
@@ -409,7 +772,14 @@ def main():
     test_calculate_tool()
     test_statistics_tools()
     test_math_functions()
+    test_vector_functions()
+    test_linalg_tools()
+    test_integration_tool()
     test_error_cases()
+    test_admission_control()
+    test_profiler()
+    test_tracing()
+    test_compression()
     test_api_documentation()
     
     print("\n" + "=" * 60)
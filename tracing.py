@@ -0,0 +1,175 @@
+"""
+도구 호출 단계별 트레이싱
+
+도구 호출 한 번을 다음 단계(span)로 나누어 시간을 잽니다.
+- queue: 승인 제어 대기열에서 기다린 시간
+- receive: 요청 본문 읽기
+- parse_validate: JSON 디코딩과 프레임워크의 인자 스키마 검증
+  (프레임워크 안에서 두 작업 사이에 표시할 지점이 없어 한 단계로 잽니다)
+- input_check: 도구 함수의 입력 검사 (빈 목록, 정의역 등)
+- compute: 실제 계산
+- build_response: 응답 모델 생성
+- serialize: 응답 JSON 직렬화 및 응답 헤더 전송 전까지
+
+단계 전환은 `phase(name)`로 표시하며, 진행 중인 단계가 있으면 닫고 새 단계를 엽니다.
+완료된 트레이스는 메모리 링 버퍼에 보관되고, `MCP_TRACE_FILE`이 지정되면 JSONL 파일에도 기록됩니다.
+"""
+import contextvars
+import json
+import os
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Dict, List, Optional
+
+
+class Trace:
+    """도구 호출 한 번의 단계별 시간 기록"""
+
+    __slots__ = ("trace_id", "tool", "timestamp", "status", "spans", "_start", "_phase", "_phase_start", "_end")
+
+    def __init__(self, trace_id: str, tool: str):
+        self.trace_id = trace_id
+        self.tool = tool
+        self.timestamp = time.time()
+        self.status = 0
+        self.spans: List[tuple] = []
+        self._start = time.perf_counter()
+        self._phase: Optional[str] = None
+        self._phase_start = self._start
+        self._end: Optional[float] = None
+
+    def mark(self, name: Optional[str]) -> None:
+        """진행 중인 단계를 닫고 name 단계를 엽니다 (None이면 닫기만 합니다)."""
+        now = time.perf_counter()
+        if self._phase is not None:
+            self.spans.append((self._phase, self._phase_start - self._start, now - self._phase_start))
+        self._phase = name
+        self._phase_start = now
+
+    def finish(self, status: int) -> None:
+        self.mark(None)
+        self.status = status
+        self._end = time.perf_counter()
+
+    @property
+    def total_ms(self) -> float:
+        end = self._end if self._end is not None else time.perf_counter()
+        return (end - self._start) * 1000
+
+    def server_timing(self) -> str:
+        """Server-Timing 헤더 값을 만듭니다."""
+        return ", ".join(f"{name};dur={duration * 1000:.3f}" for name, _, duration in self.spans)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "trace_id": self.trace_id,
+            "tool": self.tool,
+            "timestamp": self.timestamp,
+            "status": self.status,
+            "total_ms": round(self.total_ms, 3),
+            "spans": [
+                {"name": name, "start_ms": round(start * 1000, 3), "duration_ms": round(duration * 1000, 3)}
+                for name, start, duration in self.spans
+            ]
+        }
+
+
+# 현재 요청의 트레이스 (미들웨어가 설정하고 도구 함수가 단계를 표시합니다)
+current_trace: contextvars.ContextVar[Optional[Trace]] = contextvars.ContextVar(
+    "current_trace", default=None
+)
+
+
+def phase(name: str) -> None:
+    """현재 요청의 트레이스에 단계 전환을 기록합니다 (트레이스가 없으면 아무것도 하지 않습니다)."""
+    trace = current_trace.get()
+    if trace is not None:
+        trace.mark(name)
+
+
+def new_trace_id() -> str:
+    return os.urandom(8).hex()
+
+
+class TraceSink:
+    """완료된 트레이스를 링 버퍼와 (선택적으로) JSONL 파일에 보관합니다."""
+
+    def __init__(self, capacity: int, path: Optional[str] = None):
+        self._buffer: deque = deque(maxlen=capacity)
+        self._lock = threading.Lock()
+        self._file = open(path, "a", encoding="utf-8", buffering=1) if path else None
+
+    def record(self, trace: Trace) -> None:
+        with self._lock:
+            self._buffer.append(trace)
+            if self._file is not None:
+                self._file.write(json.dumps(trace.to_dict(), ensure_ascii=False) + "\n")
+
+    def slowest(self, limit: int = 10, tool: Optional[str] = None) -> List[Dict[str, Any]]:
+        with self._lock:
+            traces = [t for t in self._buffer if tool is None or t.tool == tool]
+        traces.sort(key=lambda t: t.total_ms, reverse=True)
+        return [t.to_dict() for t in traces[:limit]]
+
+    def __len__(self) -> int:
+        return len(self._buffer)
+
+
+class TracingMiddleware:
+    """도구 호출마다 트레이스를 만들고 X-Trace-Id, Server-Timing 헤더를 붙이는 ASGI 미들웨어
+
+    트레이스는 응답 헤더를 보내는 시점에 끝나며, 본문 전송은 포함하지 않습니다.
+    """
+
+    def __init__(self, app, sink: TraceSink, tool_for_path: Callable[[str], Optional[str]]):
+        self.app = app
+        self.sink = sink
+        self.tool_for_path = tool_for_path
+
+    async def __call__(self, scope, receive, send):
+        tool = None
+        if scope["type"] == "http" and scope["method"] == "POST":
+            tool = self.tool_for_path(scope["path"])
+        if tool is None:
+            await self.app(scope, receive, send)
+            return
+
+        trace_id = next(
+            (value.decode("latin-1") for key, value in scope["headers"] if key == b"x-trace-id"), None
+        )
+        trace = Trace(trace_id or new_trace_id(), tool)
+        trace.mark("queue")
+
+        async def receive_with_mark():
+            message = await receive()
+            # 본문의 마지막 조각을 넘기면 프레임워크가 디코딩과 인자 검증을 시작합니다
+            if message["type"] == "http.request" and not message.get("more_body", False):
+                trace.mark("parse_validate")
+            return message
+
+        async def send_with_timing(message):
+            if message["type"] == "http.response.start":
+                trace.finish(message["status"])
+                message["headers"] = [
+                    *message.get("headers", []),
+                    (b"x-trace-id", trace.trace_id.encode("latin-1")),
+                    (b"server-timing", trace.server_timing().encode("latin-1"))
+                ]
+            await send(message)
+
+        token = current_trace.set(trace)
+        try:
+            await self.app(scope, receive_with_mark, send_with_timing)
+        finally:
+            current_trace.reset(token)
+            if trace.status == 0:
+                # 응답을 시작하기 전에 예외가 난 경우
+                trace.finish(500)
+            self.sink.record(trace)
+
+
+trace_sink = TraceSink(
+    capacity=int(os.environ.get("MCP_TRACE_BUFFER", "1000")),
+    path=os.environ.get("MCP_TRACE_FILE") or None
+)
@@ -0,0 +1,62 @@
+"""
+계산용 워커 풀
+
+여러 코어에 나눠 실행하는 계산(몬테카를로 적분 등)에서 사용하는 스레드 풀입니다.
+NumPy 연산은 실행 중 GIL을 놓으므로 스레드로도 코어 수만큼 확장됩니다.
+풀은 처음 작업이 제출될 때 만들어지며, 대기 중인 작업 수를 상태 확인용으로 집계합니다.
+"""
+import os
+import threading
+from typing import Any, Callable, Dict, List
+
+# 워커 수 (기본값: CPU 코어 수)
+MAX_WORKERS = int(os.environ.get("MCP_COMPUTE_WORKERS", os.cpu_count() or 1))
+
+_pool = None
+_lock = threading.Lock()
+_pending = 0
+_running = 0
+
+
+def _get_pool():
+    global _pool
+    if _pool is None:
+        with _lock:
+            if _pool is None:
+                from concurrent.futures import ThreadPoolExecutor
+                _pool = ThreadPoolExecutor(max_workers=MAX_WORKERS, thread_name_prefix="mcp-compute")
+    return _pool
+
+
+def _tracked(func: Callable, args: tuple):
+    global _pending, _running
+    with _lock:
+        _pending -= 1
+        _running += 1
+    try:
+        return func(*args)
+    finally:
+        with _lock:
+            _running -= 1
+
+
+def map_parallel(func: Callable, arguments: List[tuple]) -> List[Any]:
+    """arguments의 각 인자 묶음으로 func를 풀에서 실행하고 결과를 순서대로 반환합니다."""
+    global _pending
+    if len(arguments) == 1:
+        return [func(*arguments[0])]
+    pool = _get_pool()
+    with _lock:
+        _pending += len(arguments)
+    futures = [pool.submit(_tracked, func, args) for args in arguments]
+    return [future.result() for future in futures]
+
+
+def stats() -> Dict[str, Any]:
+    """풀 상태 (대기 중/실행 중인 작업 수)"""
+    return {
+        "max_workers": MAX_WORKERS,
+        "started": _pool is not None,
+        "queue_depth": _pending,
+        "running": _running
+    }